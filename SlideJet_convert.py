@@ -4,11 +4,11 @@ import shutil
 import json
 import yaml
 import streamlit as st
-import pythoncom
-import win32com.client
 from PIL import Image
 from pathlib import Path
 import re
+import hashlib
+from slidejet.runtime import PDF_ARTIFACT_FOLDER, PDF_DEFAULT_PROFILE, PDF_PROFILES, build_pdf_artifacts, languages
 
 # SlideJet_convert is a tool to turn PowerPoint presentations in Streamlit Slideshows
 #
@@ -27,6 +27,13 @@ def clear_old_files(folder_path):
 
 def convert_ppt_to_images_using_powerpoint(ppt_path, image_dir):
     """Uses PowerPoint COM automation to export full slides as images"""
+    # pywin32 is only needed (and only available) on Windows; the other helpers work without it
+    try:
+        import pythoncom
+        import win32com.client
+    except ImportError as e:
+        raise RuntimeError("Converting requires Windows with PowerPoint and the pywin32 package (pip install pywin32).") from e
+
     pythoncom.CoInitialize()
     powerpoint = win32com.client.Dispatch("PowerPoint.Application")
     powerpoint.Visible = 1          # Run PowerPoint in the background
@@ -60,10 +67,31 @@ def convert_ppt_to_images_using_powerpoint(ppt_path, image_dir):
     pythoncom.CoUninitialize()
     return slide_data
 
-def save_slide_data_json(slide_data, json_file):
-    """Saves slide images and notes in a structured JSON format for Streamlit slideshow."""
+def publish_static_images(slide_data, image_dir, static_dir, deck_name):
+    """
+    Copies the slide images into Streamlit's static folder with content-hashed file names
+    (e.g. slide_1.3fa2b9c01d4e.png) and adds their URL to the slide data. A changed slide gets a
+    new file name, so browsers can keep the images cached.
+    """
+    deck_static_dir = os.path.join(static_dir, deck_name)
+    clear_old_files(deck_static_dir)
+    for slide in slide_data:
+        image_path = os.path.join(image_dir, os.path.basename(slide["image"]))
+        with open(image_path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()[:12]
+        stem, ext = os.path.splitext(os.path.basename(image_path))
+        static_name = f"{stem}.{digest}{ext}"
+        shutil.copyfile(image_path, os.path.join(deck_static_dir, static_name))
+        slide["url"] = f"/app/static/{deck_name}/{static_name}"
+    return slide_data
+
+def save_slide_data_json(slide_data, json_file, pdfs=None):
+    """
+    Saves slide images and notes in a structured JSON format for Streamlit slideshow.
+    With pre-built PDFs (see slidejet/runtime.py) the file is {"slides": [...], "pdfs": [...]}.
+    """
     with open(json_file, "w") as f:
-        json.dump(slide_data, f, indent=4)
+        json.dump({"slides": slide_data, "pdfs": pdfs} if pdfs else slide_data, f, indent=4)
 
 def save_yaml_config(yaml_output_path, slides_subfolder, header_text, subheader_text, mode, yaml_repo_path=None):
     if mode == "Local use":
@@ -85,6 +113,13 @@ def save_yaml_config(yaml_output_path, slides_subfolder, header_text, subheader_
         yaml.dump(config, f, default_flow_style=False, sort_keys=False)
 
 
+def copy_slidejet_package(target_dir: str | Path):
+    """Copies the slidejet package (next to this converter) into target_dir, so the presenter there is self-contained."""
+    source = Path(__file__).resolve().parent / "slidejet"
+    target = Path(target_dir).resolve() / "slidejet"
+    if source != target:
+        shutil.copytree(source, target, dirs_exist_ok=True, ignore=shutil.ignore_patterns("__pycache__"))
+
 def emit_present_script(
     yaml_file: str | Path,
     template_source: str | Path | None = None,
@@ -94,13 +129,16 @@ def emit_present_script(
     yaml_repo_path: str | None = None,   # repo-root–relative dir for ONLINE use
 ) -> Path:
     """
-    Emit a presenter script next to the YAML.
+    Emit a presenter script next to the YAML. The script is a small stub that calls
+    slidejet.render_deck, the presenter logic stays in the slidejet package.
 
     - If yaml_repo_path is given (Online use), the presenter will reference:
         f"{yaml_repo_path}/{<yaml_basename>}"
       which matches Streamlit Cloud's CWD = repo root.
     - Otherwise (Local use), it references a path relative to the presenter file.
-    - If multipage=True, the st.set_page_config(...) line is commented out.
+    - Online use: the slidejet package is expected at the repository root (SLIDEJET_PATH goes up
+      from yaml_repo_path). Local use: the package is copied next to the presenter.
+    - If multipage=True, the presenter leaves the page config to the multipage app.
     - app_id is injected for namespacing (expects __APP_ID__ placeholder or literal APP_ID).
     """
     yaml_path = Path(yaml_file).resolve()
@@ -129,6 +167,13 @@ def emit_present_script(
         # Local use: relative to presenter location
         injected_yaml = Path(os.path.relpath(yaml_path, start=target_dir)).as_posix()
 
+    # slidejet package, relative to the presenter location (never to where this converter is installed)
+    if yaml_repo_path:
+        slidejet_path = "/".join([".."] * len(Path(repo_rel_dir).parts)) or "."
+    else:
+        copy_slidejet_package(target_dir)
+        slidejet_path = "."
+
     # --- Token replacements (simple)
     out_text = tpl_text
     out_text = out_text.replace("__SLIDEJET_YAML__", injected_yaml)
@@ -143,15 +188,8 @@ def emit_present_script(
     out_text = re.sub(r'(IN_MULTIPAGE\s*=\s*)(True|False)', rf'\1{"True" if multipage else "False"}', out_text)
     # APP_ID = "..."
     out_text = re.sub(r'(APP_ID\s*=\s*)(["\']).*?\2', rf'\1"{app_id}"', out_text)
-
-    # --- If multipage, comment out st.set_page_config(...) line
-    if multipage:
-        out_text = re.sub(
-            r'^\s*st\.set_page_config\([^\n]*\)\s*$',
-            lambda m: f'# {m.group(0)}',
-            out_text,
-            flags=re.MULTILINE
-        )
+    # SLIDEJET_PATH = "..."
+    out_text = re.sub(r'(SLIDEJET_PATH\s*=\s*)(["\']).*?\2', rf'\1"{slidejet_path}"', out_text)
 
     # Write presenter: <BASE>_SJpresent.py
     present_name = f"{base_name}_SJpresent.py"
@@ -229,6 +267,7 @@ if uploaded_file:
             │       │   ├── slide_1.png           # image file of the slides
             │       │   ├── slide_2.png
             │       │   └── slide_n.png
+            │       ├── 📁 pdf\                   # optional: pre-built PDF downloads
             │       └── slide_data.json           # (3b) JSON with speaker notes
             ├── [PRESENTATION_NAME]_SJpresent.py  # (1) SlideJet_present app 
             └── [PRESENTATION_NAME]_SJconfig.yaml # (2) YAML config. data for (1)
@@ -327,7 +366,7 @@ if uploaded_file:
     st.markdown("""
     ***SlideJet-***:green[***Convert***] creates the ***SlideJet-***:blue[***Present***] file.
     
-    :red[Make sure] that the template file **SlideJet_present_template.py** exists in the folder from where you run this script.
+    :red[Make sure] that the template file **SlideJet_present_template.py** and the **slidejet** folder (the presenter runtime) exist in the folder from where you run this script. The ***SlideJet-***:blue[***Present***] file uses the **slidejet** folder, so keep (or deploy) it together with your presentations.
     
     If your presentation will be part of a multipage app, the ***SlideJet-***:blue[***Present***] app will be without a separate page title but requires a unique ID.
     
@@ -340,6 +379,24 @@ if uploaded_file:
     app_id = "app_01"
     if multipage_true:
         app_id = st.text_input("Multipage app_id (used for namespacing state etc.)", value="app_01")
+
+    static_images = st.checkbox("Serve the slides as static files (browsers can cache them, requires `enableStaticServing`)", value=False)
+    if static_images:
+        st.markdown("""
+        The slide images are additionally copied with content-hashed file names into a **static** folder next to the ***SlideJet-***:blue[***Present***] script. The presenter then shows the slides by URL, so browsers reuse them across reruns, sessions and page reloads. If the presentation is part of a multipage app, the **static** folder must be next to the main script of the app. Apps that find no **static** copy of the slides (e.g., the hub in another folder) show the images from the **images** folder instead.
+        
+        Static file serving has to be enabled in the `.streamlit/config.toml` of the folder where you run `streamlit run` (e.g., the repository root):
+        """)
+        st.code("[server]\nenableStaticServing = true", language="toml")
+
+    prebuild_pdfs = st.checkbox("Pre-build the PDF downloads (the presenter serves them without generating them)", value=False)
+    if prebuild_pdfs:
+        st.markdown("""
+        The PDFs without notes and with the original notes (and optionally with translated notes) are generated now and saved in a **pdf** folder next to the slide images. The ***SlideJet-***:blue[***Present***] app offers them for download right away; PDFs of slide ranges, other languages or other qualities are still generated on demand. Translations require an internet connection.
+        """)
+        pdf_languages = st.multiselect("Notes PDFs in further languages", options=list(languages))
+        pdf_profile = st.radio("PDF quality", options=list(PDF_PROFILES), index=list(PDF_PROFILES).index(PDF_DEFAULT_PROFILE),
+                               format_func=lambda name: PDF_PROFILES[name]["label"], horizontal=True)
     
     col1, col2, col3 = st.columns((1,1,1))
     with col2:
@@ -352,11 +409,33 @@ if uploaded_file:
             temp_ppt_path = tmp_file.name
 
         # Convert PPT slides to images using PowerPoint automation and extract notes
-        slide_data = convert_ppt_to_images_using_powerpoint(temp_ppt_path, IMAGE_DIR)
+        try:
+            slide_data = convert_ppt_to_images_using_powerpoint(temp_ppt_path, IMAGE_DIR)
+        except RuntimeError as e:
+            os.remove(temp_ppt_path)
+            st.error(str(e))
+            st.stop()
+
+        # Optionally publish the images for Streamlit's static file serving
+        if slide_data and static_images:
+            publish_static_images(slide_data, IMAGE_DIR, os.path.join(present_folder, "static"), os.path.basename(os.path.normpath(OUTPUT_DIR)))
+            st.success(f"Slides published for static file serving in `{os.path.join(present_folder, 'static')}`.")
 
         # Save slide data JSON for Streamlit slideshow
         save_slide_data_json(slide_data, JSON_FILE)
 
+        # Optionally pre-build the PDF downloads (PDFs of an earlier conversion are removed)
+        shutil.rmtree(os.path.join(OUTPUT_DIR, PDF_ARTIFACT_FOLDER), ignore_errors=True)
+        if slide_data and prebuild_pdfs:
+            pdf_progress = st.progress(0.0, text="Building PDFs ...")
+            pdfs, skipped = build_pdf_artifacts(
+                JSON_FILE, IMAGE_DIR, OUTPUT_DIR, [languages[name] for name in pdf_languages], pdf_profile,
+                progress=lambda done, total: pdf_progress.progress(done / total, text=f"Building PDFs ({done} of {total})"))
+            save_slide_data_json(slide_data, JSON_FILE, pdfs)
+            st.success(f"{len(pdfs)} PDFs pre-built in `{os.path.join(OUTPUT_DIR, PDF_ARTIFACT_FOLDER)}`.")
+            if skipped:
+                st.warning(f"The notes could not be translated into {', '.join(skipped)}; these PDFs are generated by the presenter on demand.")
+
         if slide_data:
             st.success(f"Slides and notes successfully saved in `{OUTPUT_DIR}` (contains `images/` and `slide_data.json`).")
             st.success(f"Slide data JSON saved in `{JSON_FILE}`.")
@@ -410,7 +489,7 @@ if uploaded_file:
             `streamlit run <path_to_your_presenter_script_SJpresent.py>`
             
             - For Streamlit Cloud deployment:  
-            commit the generated files to your GitHub repository and deploy the presenter script, e.g., through [Streamlit Cloud](https://share.streamlit.io/).
+            commit the generated files and the **slidejet** folder (in the root of the repository) to your GitHub repository and deploy the presenter script, e.g., through [Streamlit Cloud](https://share.streamlit.io/).
             
             """)
         
@@ -0,0 +1,148 @@
+import os
+import hashlib
+from pathlib import Path
+import yaml
+import streamlit as st
+from slidejet import render_deck
+
+# SlideJet_hub presents every SlideJet deck of a folder from one Streamlit app
+#
+# Execute this script with Streamlit from your project root (e.g., the root of your GitHub repo):
+#     streamlit run SlideJet_hub.py
+#
+# The hub finds all *_SJconfig.yaml files and all decks in SJ_DATA folders (slide_data.json),
+# lists them in the sidebar and loads a deck only when it is opened. All decks are rendered by
+# the slidejet package in this process, so translation and image caches are shared.
+
+###########################
+# EVENTUALLY ADAPT HERE:
+
+# --- Folder that contains the presentations (searched recursively), use / ---
+HUB_ROOT = "SlideJet_Presentations"
+#
+###########################
+
+# Folders that never contain decks (skipped while indexing)
+SKIP_FOLDERS = {"images", "static", ".git", "__pycache__", ".streamlit"}
+INDEX_TTL = 60    # seconds until the deck index is rebuilt (earlier if the hub folder changes)
+
+
+# --- Functions ---------------------------------------------------------------
+
+def index_signature(root):
+    """Cheap change signature for the index: mtimes of the hub folder and its SJ_DATA folder."""
+    signature = []
+    for folder in (root, os.path.join(root, "SJ_DATA")):
+        if os.path.isdir(folder):
+            signature.append(os.stat(folder).st_mtime_ns)
+    return tuple(signature)
+
+def resolve_presentation_folder(presentation_folder, yaml_dir):
+    """presentation_folder is relative to the working directory (online use) or to the YAML (local use)."""
+    for folder in (presentation_folder, os.path.join(yaml_dir, presentation_folder)):
+        if os.path.isfile(os.path.join(folder, "slide_data.json")):
+            return folder
+    return None
+
+@st.cache_data(show_spinner=False, ttl=INDEX_TTL)
+def index_decks(root, signature):
+    """
+    Builds the deck index of the hub folder. Returns a list of deck dicts with
+    id, title, subtitle, presentation_folder and yaml (None for decks without a usable YAML file).
+    Decks are only listed here; their slides are loaded when a deck is opened.
+    """
+    decks = {}
+    data_folders = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_FOLDERS)
+        for name in sorted(filenames):
+            path = os.path.join(dirpath, name)
+            if name.endswith("_SJconfig.yaml"):
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        config = yaml.safe_load(f)
+                    folder = resolve_presentation_folder(config["presentation_folder"], dirpath)
+                except (OSError, yaml.YAMLError, TypeError, KeyError):
+                    continue
+                if folder is None:
+                    continue
+                deck_id = Path(os.path.relpath(path, root)).as_posix()[:-len("_SJconfig.yaml")]
+                decks[os.path.realpath(folder)] = {
+                    "id": deck_id,
+                    "title": str(config.get("header_text", deck_id)),
+                    "subtitle": str(config.get("subheader_text", "")),
+                    "presentation_folder": Path(folder).as_posix(),
+                    # The presenter reads the YAML itself only if its paths work from the working directory
+                    "yaml": Path(path).as_posix() if folder == config["presentation_folder"] else None,
+                }
+            elif name == "slide_data.json":
+                data_folders.append(dirpath)
+
+    # Decks in SJ_DATA without a YAML file
+    for folder in data_folders:
+        if os.path.realpath(folder) not in decks:
+            deck_id = Path(os.path.relpath(folder, root)).as_posix()
+            decks[os.path.realpath(folder)] = {
+                "id": deck_id,
+                "title": os.path.basename(folder).replace("_", " "),
+                "subtitle": "Interactive Slideshow",
+                "presentation_folder": Path(folder).as_posix(),
+                "yaml": None,
+            }
+    return sorted(decks.values(), key=lambda deck: deck["title"].lower())
+
+def deck_app_id(deck):
+    """Unique app_id per deck, namespaces the session state of the presenter."""
+    return "hub_" + hashlib.sha1(deck["id"].encode("utf-8")).hexdigest()[:10]
+
+def show_deck(deck):
+    """Renders a deck with the SlideJet presenter; its slides are loaded on first access."""
+    app_id = deck_app_id(deck)
+    yaml_path = deck["yaml"] or ""
+    if not yaml_path and st.session_state.get(f"{app_id}_config") is None:
+        # No usable YAML (deck without YAML or local-use paths): hand the config to the presenter directly
+        st.session_state[f"{app_id}_config"] = {
+            "presentation_folder": deck["presentation_folder"],
+            "header_text": deck["title"],
+            "subheader_text": deck["subtitle"] or "Interactive Slideshow",
+        }
+    render_deck(yaml_path, app_id, multipage=True)
+
+# --- Application -------------------------------------------------------------
+
+st.set_page_config(page_title="SlideJet - Hub", page_icon="🚀")
+
+decks = index_decks(HUB_ROOT, index_signature(HUB_ROOT))
+decks_by_id = {deck["id"]: deck for deck in decks}
+
+with st.sidebar:
+    st.title("🚀 SlideJet-Hub")
+    st.caption(f"{len(decks)} presentations in `{HUB_ROOT}`")
+    search = st.text_input("Search presentations", placeholder="Title or folder")
+    matches = [deck for deck in decks if search.lower() in f"{deck['title']} {deck['subtitle']} {deck['id']}".lower()]
+
+    selected_id = st.query_params.get("deck")
+    options = [deck["id"] for deck in matches]
+    if selected_id in decks_by_id and selected_id not in options:
+        options.insert(0, selected_id)
+    selected_id = st.selectbox(
+        "Presentation",
+        options=options,
+        index=options.index(selected_id) if selected_id in options else None,
+        format_func=lambda deck_id: decks_by_id[deck_id]["title"],
+        placeholder="Choose a presentation",
+    )
+
+if selected_id is None:
+    st.header(':blue[SlideJet-Hub]')
+    st.subheader("Presentations", divider='blue')
+    if not decks:
+        st.warning(f"No SlideJet presentations found in `{HUB_ROOT}`.")
+    for deck in matches[:50]:
+        st.markdown(f"- [**{deck['title']}**](?deck={deck['id']}) {deck['subtitle']}")
+    if len(matches) > 50:
+        st.caption(f"{len(matches) - 50} more presentations, use the search in the sidebar.")
+    st.stop()
+
+st.query_params["deck"] = selected_id
+show_deck(decks_by_id[selected_id])
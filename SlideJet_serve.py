@@ -0,0 +1,47 @@
+import glob
+import os
+from contextlib import asynccontextmanager
+import streamlit as st
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+from slidejet.runtime import perf_prometheus, start_warmup, warmup_status
+
+# SlideJet_serve runs a SlideJet app (by default the hub) and warms up the decks when the server starts
+#
+# Execute this script with Streamlit from your project root (requires a Streamlit version with st.App):
+#     streamlit run SlideJet_serve.py
+#
+# Decks whose YAML contains a warmup section (see slidejet/runtime.py) are loaded into the caches
+# in the background before the first viewer arrives. The progress is available as JSON at
+#     http://<server>/slidejet/status
+# and the timings and cache counters of the presenter (for Prometheus) at
+#     http://<server>/slidejet/metrics
+
+###########################
+# EVENTUALLY ADAPT HERE:
+
+# --- Streamlit app to serve (hub or a single *_SJpresent.py), relative to this script ---
+APP_SCRIPT = "SlideJet_hub.py"
+
+# --- Folder with the *_SJconfig.yaml files to warm up (searched recursively), use / ---
+WARMUP_FOLDER = "SlideJet_Presentations"
+#
+###########################
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # Each warm-up runs in its own background thread, the server starts right away
+    for yaml_file in sorted(glob.glob(os.path.join(WARMUP_FOLDER, "**", "*_SJconfig.yaml"), recursive=True)):
+        start_warmup(yaml_file)
+    yield
+
+async def status(request):
+    decks = warmup_status()
+    ready = all(deck["state"] != "running" for deck in decks.values())
+    return JSONResponse({"ready": ready, "decks": decks})
+
+async def metrics(request):
+    return PlainTextResponse(perf_prometheus(), media_type="text/plain; version=0.0.4")
+
+app = st.App(APP_SCRIPT, lifespan=lifespan, routes=[Route("/slidejet/status", status), Route("/slidejet/metrics", metrics)])
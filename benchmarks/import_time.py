@@ -0,0 +1,96 @@
+"""
+Import-time benchmark for the SlideJet presenter.
+
+Runs the module-level imports of SlideJet_present_template.py in a fresh interpreter with
+`python -X importtime` and reports how much they add on top of `import streamlit`.
+It fails (exit code 1) if the overhead exceeds the threshold or if one of the heavy
+dependencies that should only be imported lazily is imported at startup.
+
+Usage:
+    python benchmarks/import_time.py [--runs 5] [--max-overhead-ms 150]
+"""
+
+import argparse
+import ast
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PRESENTER = ROOT / "SlideJet_present_template.py"
+
+# Imported in the functions that need them (translation, PDF generation)
+LAZY_MODULES = ["deep_translator", "reportlab"]
+
+
+def presenter_imports(path=PRESENTER):
+    """Returns the module-level import statements of the presenter as source code."""
+    source = Path(path).read_text(encoding="utf-8")
+    tree = ast.parse(source)
+    lines = [ast.get_source_segment(source, node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    return "\n".join(lines)
+
+
+def import_times(code):
+    """
+    Runs code with -X importtime in a fresh interpreter.
+    Returns {module: cumulative_microseconds} for the top-level imports.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, cwd=ROOT, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nested imports are indented; only the top-level entries add up to the total
+        if not name[1:].startswith(" "):
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def measure(code, runs):
+    """Median total import time in milliseconds and the module times of the last run."""
+    totals = []
+    for _ in range(runs):
+        times = import_times(code)
+        totals.append(sum(times.values()) / 1000)
+    return statistics.median(totals), times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="number of interpreter starts (median is used)")
+    parser.add_argument("--max-overhead-ms", type=float, default=150,
+                        help="allowed import time of the presenter on top of `import streamlit`")
+    args = parser.parse_args()
+
+    code = presenter_imports()
+    baseline_ms, _ = measure("import streamlit", args.runs)
+    presenter_ms, times = measure(code, args.runs)
+    overhead_ms = presenter_ms - baseline_ms
+
+    print(f"import streamlit:        {baseline_ms:8.1f} ms")
+    print(f"presenter imports:       {presenter_ms:8.1f} ms")
+    print(f"overhead over streamlit: {overhead_ms:8.1f} ms (limit {args.max_overhead_ms:.0f} ms)")
+    print("\nSlowest top-level imports:")
+    for name, us in sorted(times.items(), key=lambda item: item[1], reverse=True)[:10]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+    loaded = subprocess.run([sys.executable, "-c", f"{code}\nimport sys\nprint(' '.join(sys.modules))"],
+                            capture_output=True, text=True, cwd=ROOT, check=True).stdout.split()
+    eager = [module for module in LAZY_MODULES if module in loaded]
+
+    failed = False
+    if eager:
+        print(f"\nFAIL: imported at startup, should be lazy: {', '.join(eager)}")
+        failed = True
+    if overhead_ms > args.max_overhead_ms:
+        print(f"\nFAIL: presenter import overhead {overhead_ms:.1f} ms exceeds {args.max_overhead_ms:.0f} ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
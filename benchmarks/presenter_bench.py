@@ -0,0 +1,309 @@
+"""
+Benchmark suite for the SlideJet presenter (slidejet/runtime.py).
+
+Generates synthetic decks in the SJ_DATA layout (Pillow-drawn slides at several resolutions,
+notes with sentences, bullet items and protected terms) and measures per deck:
+
+- deck_load_ms                  loading and validating slide_data.json (cold)
+- first_run_ms, navigation_ms   presenter script runs through Streamlit's AppTest (median per rerun)
+- pdf_{plain,notes}_s / _peak_mb  PDF without / with notes, cold page cache (time, Python heap peak)
+- terms_per_s                   protect_terms + restore_terms on the notes
+- translation_{cold,warm}_per_s notes translated per second with an offline stub translator
+
+Results are written as JSON (--output) to compare them across commits. With --baseline, the run
+fails (exit code 1) if a metric is worse than the baseline by more than --max-regression.
+
+Usage:
+    python benchmarks/presenter_bench.py [--slides 20] [--resolutions 1280x720,1920x1080]
+        [--runs 5] [--translator-latency-ms 0] [--output results.json]
+        [--baseline previous.json] [--max-regression 0.25]
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+WORDS = ("aquifer groundwater model boundary recharge flow gradient parameter calibration head well pumping "
+         "storage layer conductivity transport slide figure example result method equation data lecture").split()
+TERMS = ["SlideJet", "PowerPoint", "Streamlit", "Python", "GitHub"]
+
+# Streamlit script that shows a synthetic deck with the presenter (filled in by bench_navigation)
+PRESENTER_SCRIPT = """
+import sys
+sys.path.insert(0, {root!r})
+from slidejet import render_deck
+render_deck({yaml!r}, "bench")
+"""
+
+
+# --- Synthetic decks -----------------------------------------------------------
+
+def notes_text(rng: random.Random):
+    """Speaker notes like PowerPoint exports them: sentences, bullet items and \\r line breaks."""
+    def sentence():
+        words = rng.choices(WORDS, k=rng.randint(6, 16))
+        if rng.random() < 0.4:
+            words.insert(rng.randrange(len(words)), rng.choice(TERMS))
+        return " ".join(words).capitalize() + rng.choice([".", ".", "!", "?"])
+
+    paragraphs = [" ".join(sentence() for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(1, 3))]
+    if rng.random() < 0.5:
+        paragraphs.append("\r".join(f"- {sentence()}" for _ in range(rng.randint(2, 5))))
+    return "\r\r".join(paragraphs)
+
+def draw_slide(rng: random.Random, size: tuple, number: int):
+    """A slide image with a title bar, text lines, shapes and a noisy 'photo' area."""
+    from PIL import Image, ImageDraw, ImageFont
+
+    width, height = size
+    img = Image.new("RGB", size, "white")
+    draw = ImageDraw.Draw(img)
+    font = ImageFont.load_default(size=max(12, height // 24))
+    draw.rectangle([0, 0, width, height // 8], fill=(31, 78, 121))
+    draw.text((width // 30, height // 40), f"Slide {number}: {' '.join(rng.choices(WORDS, k=3)).title()}", fill="white", font=font)
+    for line in range(rng.randint(3, 7)):
+        y = height // 6 + line * height // 12
+        draw.text((width // 20, y), "- " + " ".join(rng.choices(WORDS, k=rng.randint(3, 7))), fill=(40, 40, 40), font=font)
+    for _ in range(rng.randint(2, 6)):
+        x, y = rng.randrange(width // 2, width - 40), rng.randrange(height // 4, height - 40)
+        draw.ellipse([x, y, x + rng.randint(20, width // 6), y + rng.randint(20, height // 6)],
+                     outline=(200, 60, 40), width=3, fill=tuple(rng.randrange(256) for _ in range(3)))
+    photo = (width // 2, height // 3)
+    noise = Image.effect_noise(photo, 40).convert("RGB")
+    img.paste(Image.blend(noise, Image.new("RGB", photo, (90, 140, 90)), 0.6), (width // 2 - width // 20, height // 2))
+    return img
+
+def make_deck(workdir: Path, name: str, slides: int, size: tuple, seed: int = 0):
+    """Writes a deck (SJ_DATA/<name>/images, slide_data.json) and its YAML; returns the YAML path."""
+    rng = random.Random(seed)
+    deck = workdir / "SJ_DATA" / name
+    (deck / "images").mkdir(parents=True, exist_ok=True)
+    slide_data = []
+    for i in range(1, slides + 1):
+        draw_slide(rng, size, i).save(deck / "images" / f"slide_{i}.png")
+        slide_data.append({"image": f"images/slide_{i}.png", "notes": notes_text(rng)})
+    with open(deck / "slide_data.json", "w") as f:
+        json.dump(slide_data, f, indent=4)
+    yaml_file = workdir / f"{name}_SJconfig.yaml"
+    yaml_file.write_text(f"presentation_folder: {deck.as_posix()}\nheader_text: {name}\nsubheader_text: Benchmark\n")
+    return yaml_file
+
+
+# --- Offline translator --------------------------------------------------------
+
+class StubTranslator:
+    """Offline stand-in for deep_translator.GoogleTranslator: tags every line, after an optional latency."""
+    latency = 0.0
+    requests = 0
+
+    def __init__(self, source="auto", target="de"):
+        self.target = target
+
+    def translate(self, text):
+        StubTranslator.requests += 1
+        if StubTranslator.latency:
+            time.sleep(StubTranslator.latency)
+        return "\n".join(f"[{self.target}] {line}" for line in text.split("\n"))
+
+def install_stub_translator(latency_ms: float):
+    StubTranslator.latency = latency_ms / 1000
+    sys.modules["deep_translator"] = types.SimpleNamespace(GoogleTranslator=StubTranslator)
+
+
+# --- Benchmarks ----------------------------------------------------------------
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+def rate(func, items: int, runs: int, min_time: float = 0.2):
+    """Median items per second of func (one pass over items), each run repeats it for at least min_time."""
+    rates = []
+    for _ in range(runs):
+        passes, start = 0, time.perf_counter()
+        while True:
+            func()
+            passes += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        rates.append(items * passes / elapsed)
+    return statistics.median(rates)
+
+def bench_deck_load(runtime, json_file: str, runs: int):
+    times = []
+    for _ in range(runs):
+        runtime.load_deck.clear()
+        times.append(timed(runtime.load_deck, *runtime.file_reference(json_file))[0])
+    return {"deck_load_ms": statistics.median(times) * 1000}
+
+def quiet_streamlit():
+    """Hides "No runtime found" and "missing ScriptRunContext" warnings outside of streamlit run."""
+    import streamlit.logger
+
+    streamlit.logger.set_log_level("error")
+
+def bench_navigation(yaml_file: Path, workdir: Path, runs: int):
+    from streamlit.testing.v1 import AppTest
+
+    script = workdir / "bench_SJpresent.py"
+    script.write_text(PRESENTER_SCRIPT.format(root=str(ROOT), yaml=yaml_file.as_posix()))
+    at = AppTest.from_file(str(script), default_timeout=60)
+    first, _ = timed(at.run)
+    quiet_streamlit()   # AppTest sets up the logging again
+    if at.exception:
+        raise RuntimeError(f"Presenter failed: {at.exception[0].message}")
+    times = []
+    for _ in range(runs):
+        times.append(timed(at.number_input[0].increment().run)[0])
+    return {"first_run_ms": first * 1000, "navigation_ms": statistics.median(times) * 1000}
+
+def bench_pdf(runtime, json_file: str, runs: int):
+    """Builds both PDF variants (print profile, original notes) with a cold page cache."""
+    deck_ref = runtime.file_reference(json_file)
+    slides = runtime.load_deck(*deck_ref)
+    deck = os.path.dirname(json_file)
+    img_folder = os.path.join(deck, "images")
+    image_hashes = runtime.slide_image_hashes(deck_ref[0], deck_ref[1], img_folder)
+
+    def build(with_notes):
+        runtime.get_pdf_page_cache.clear()
+        runtime.render_pdf(slides, image_hashes, img_folder, deck, None, with_notes, io.BytesIO())
+
+    results = {}
+    for name, with_notes in (("plain", False), ("notes", True)):
+        results[f"pdf_{name}_s"] = statistics.median(timed(build, with_notes)[0] for _ in range(runs))
+        tracemalloc.start()
+        build(with_notes)
+        results[f"pdf_{name}_peak_mb"] = tracemalloc.get_traced_memory()[1] / 1024**2
+        tracemalloc.stop()
+    return results
+
+def bench_terms(runtime, notes: list, runs: int):
+    def protect_restore():
+        for text in notes:
+            protected, replacements = runtime.protect_terms(text, "de")
+            runtime.restore_terms(protected, replacements)
+
+    return {"terms_per_s": rate(protect_restore, len(notes), runs)}
+
+def bench_translation(runtime, notes: list, runs: int, lang: str = "de"):
+    """Notes per second through translate_notes: cold (empty caches and memory) and warm (cached)."""
+    def translate(cold):
+        if cold:
+            runtime._translate_notes_cached.clear()
+            runtime.get_translation_memory.clear()
+        for text in notes:
+            runtime.translate_notes(text, lang)
+
+    return {"translation_cold_per_s": rate(lambda: translate(True), len(notes), runs),
+            "translation_warm_per_s": rate(lambda: translate(False), len(notes), runs)}
+
+
+# --- Results -------------------------------------------------------------------
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=ROOT, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def regressions(metrics: dict, baseline: dict, max_regression: float):
+    """Metrics worse than the baseline by more than max_regression (fraction); *_per_s are higher-is-better."""
+    failed = []
+    for name, value in metrics.items():
+        old = baseline.get(name)
+        if not old:
+            continue
+        change = (old - value) / old if name.endswith("_per_s") else (value - old) / old
+        if change > max_regression:
+            failed.append((name, old, value, change))
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--slides", type=int, default=20, help="slides per synthetic deck")
+    parser.add_argument("--resolutions", default="1280x720,1920x1080", help="slide sizes, one deck per size")
+    parser.add_argument("--runs", type=int, default=5, help="repetitions per measurement (median is used)")
+    parser.add_argument("--translator-latency-ms", type=float, default=0, help="latency of the stub translator per request")
+    parser.add_argument("--workdir", help="folder for the synthetic decks (default: temporary, removed afterwards)")
+    parser.add_argument("--output", help="JSON file for the results")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare with")
+    parser.add_argument("--max-regression", type=float, default=0.25, help="allowed slowdown against the baseline (0.25 = 25 %%)")
+    args = parser.parse_args()
+
+    install_stub_translator(args.translator_latency_ms)
+    quiet_streamlit()
+    from slidejet import runtime
+
+    workdir = Path(args.workdir or tempfile.mkdtemp(prefix="slidejet-bench-"))
+    metrics = {}
+    try:
+        for resolution in args.resolutions.split(","):
+            size = tuple(int(value) for value in resolution.lower().split("x"))
+            name = f"bench_{args.slides}x{resolution}"
+            yaml_file = make_deck(workdir, name, args.slides, size)
+            json_file = str(workdir / "SJ_DATA" / name / "slide_data.json")
+            notes = [slide["notes"] for slide in runtime.load_deck(*runtime.file_reference(json_file))]
+
+            results = {}
+            results.update(bench_deck_load(runtime, json_file, args.runs))
+            results.update(bench_navigation(yaml_file, workdir, args.runs))
+            results.update(bench_pdf(runtime, json_file, args.runs))
+            results.update(bench_terms(runtime, notes, args.runs))
+            results.update(bench_translation(runtime, notes, args.runs))
+
+            print(f"\n{name}")
+            for metric, value in results.items():
+                print(f"  {metric:26s} {value:12.2f}")
+                metrics[f"{resolution}/{metric}"] = value
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "settings": {"slides": args.slides, "resolutions": args.resolutions, "runs": args.runs,
+                     "translator_latency_ms": args.translator_latency_ms},
+        "metrics": metrics,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        if baseline.get("settings") != report["settings"]:
+            print("\nWARNING: baseline was measured with other settings")
+        failed = regressions(metrics, baseline["metrics"], args.max_regression)
+        for name, old, value, change in failed:
+            print(f"FAIL: {name} {old:.2f} -> {value:.2f} ({change:+.0%} worse)")
+        if failed:
+            return 1
+        print(f"\nNo regression above {args.max_regression:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+"""SlideJet presenter runtime, used by the *_SJpresent.py scripts created by SlideJet_convert.py."""
+
+from .runtime import render_deck
+
+__all__ = ["render_deck"]
@@ -0,0 +1,2346 @@
+"""
+SlideJet presenter runtime.
+
+Shows a SlideJet presentation (slides and notes from SlideJet_convert.py) in Streamlit. The
+presenter scripts (*_SJpresent.py) only call render_deck; functions, caches and tables are
+set up once per process when this module is imported, not on every rerun of every page.
+
+Heavy dependencies (deep_translator, reportlab) are imported in the functions
+that need them, so sessions that never translate or download a PDF start faster.
+"""
+
+import io
+import os
+import streamlit as st
+import json
+import yaml
+from PIL import Image
+import random
+import string
+import re
+import threading
+import time
+import hashlib
+import itertools
+import functools
+import contextlib
+import logging
+import uuid
+import tempfile
+import struct
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from types import MappingProxyType
+from collections import OrderedDict
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+
+# --- FUNCTIONS ---
+
+def validate_config(config):
+    # Checks if the YAML config is complete. Warns the user if essential parts are missing.
+    if not isinstance(config, dict):
+        raise ValueError("The YAML file does not contain a SlideJet configuration (key: value pairs expected).")
+    required_keys = ["presentation_folder", "header_text", "subheader_text"]
+    missing = [key for key in required_keys if key not in config]
+    if missing:
+        raise ValueError(f"Missing required keys in YAML: {', '.join(missing)}")
+    invalid = [key for key in required_keys if not isinstance(config[key], str) or not config[key].strip()]
+    if invalid:
+        raise ValueError(f"YAML keys must be non-empty text: {', '.join(invalid)}")
+    warmup = config.get("warmup", False)
+    if not isinstance(warmup, (bool, dict)):
+        raise ValueError("YAML key warmup must be true/false or a mapping with images, languages and pdf.")
+    if isinstance(warmup, dict):
+        unknown = [key for key in warmup if key not in WARMUP_DEFAULTS]
+        if unknown:
+            raise ValueError(f"Unknown warmup keys in YAML: {', '.join(map(str, unknown))}")
+        languages = warmup.get("languages", [])
+        if not isinstance(languages, list) or not all(isinstance(lang, str) for lang in languages):
+            raise ValueError("YAML key warmup.languages must be a list of language codes (e.g., [de, fr]).")
+    if not isinstance(config.get("performance_panel", False), bool):
+        raise ValueError("YAML key performance_panel must be true or false.")
+
+def validate_slides(slides):
+    # Checks the slides of slide_data.json: a non-empty list of {"image": ..., "notes": ...}
+    if not isinstance(slides, list) or not slides:
+        raise ValueError("slide_data.json must contain a non-empty list of slides.")
+    for i, slide in enumerate(slides, start=1):
+        if not isinstance(slide, dict) or not isinstance(slide.get("image"), str):
+            raise ValueError(f"Slide {i} in slide_data.json has no image path.")
+        if not isinstance(slide.get("notes", ""), str):
+            raise ValueError(f"Slide {i} in slide_data.json has invalid notes (text expected).")
+        if not isinstance(slide.get("url", ""), str):
+            raise ValueError(f"Slide {i} in slide_data.json has an invalid static URL (text expected).")
+
+def file_reference(path: str):
+    """
+    Reference to a file as kept in the session: (resolved path, version).
+    The version is (mtime, size); a republished file gets a new reference.
+    """
+    path = os.path.realpath(path)
+    stat = os.stat(path)
+    return path, (stat.st_mtime_ns, stat.st_size)
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def load_config(yaml_file: str, version: tuple):
+    """Parse and validate a SlideJet YAML once per path and version (see file_reference)."""
+    with open(yaml_file, "r", encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+    validate_config(config)
+    return config
+
+# --- Shared deck store ---
+@st.cache_resource(show_spinner=False, max_entries=64)
+def load_deck(json_file: str, version: tuple):
+    """
+    Load and validate slide_data.json once per process and version (see file_reference). All sessions
+    share the returned read-only slides (a tuple of read-only dicts with 'image' and 'notes').
+    slide_data.json is the list of slides, or {"slides": [...], "pdfs": [...]} for a deck with
+    pre-built PDFs (see load_pdf_artifacts).
+    """
+    with open(json_file, "r") as f:
+        slides = json.load(f)
+    if isinstance(slides, dict):
+        slides = slides.get("slides")
+    validate_slides(slides)
+    return tuple(MappingProxyType(dict(slide)) for slide in slides)
+
+def generate_placeholder():
+    return ''.join(random.choices(string.ascii_lowercase + string.digits, k=10))
+
+def protect_terms(text: str, lang: str):
+    """
+    Replace protected terms by random placeholders before translation.
+    Returns (protected_text, replacements_dict).
+    """
+    replacements = {}
+    terms = protected_terms.get(lang, {})
+
+    # Longer terms first to avoid partial overlaps
+    for term in sorted(terms, key=len, reverse=True):
+        placeholder = generate_placeholder()
+        while placeholder in text or placeholder in replacements:
+            placeholder = generate_placeholder()
+
+        # Word boundary match (good for single tokens like 'Python', 'SlideJet')
+        pattern = r'\b' + re.escape(term) + r'\b'
+        text, count = re.subn(pattern, placeholder, text)
+        if count > 0:
+            replacements[placeholder] = term
+
+    return text, replacements
+
+def restore_terms(text: str, replacements: dict):
+    """
+    Replace placeholders back to original protected terms after translation.
+    """
+    for placeholder, original in replacements.items():
+        text = re.sub(re.escape(placeholder), original, text)
+    return text
+
+# --- Resilient translator calls ---
+TRANSLATION_TIMEOUT = 10       # seconds per translator request
+TRANSLATION_RETRIES = 2        # retries after the first attempt
+TRANSLATION_BACKOFF = 0.5      # base delay in seconds for the jittered exponential backoff
+BREAKER_THRESHOLD = 5          # consecutive failures that open the circuit breaker
+BREAKER_COOLDOWN = 60          # seconds the circuit stays open (original notes are shown)
+NEGATIVE_CACHE_TTL = 30        # seconds a failed note/language is not requested again
+
+class TranslationError(RuntimeError):
+    """Raised if the translator failed, timed out, or the circuit breaker is open."""
+
+@st.cache_resource
+def get_translation_guard():
+    """
+    Process-wide state for translator calls: circuit breaker and the negative cache
+    {(note_hash, lang): expiry}.
+    """
+    return {
+        "lock": threading.Lock(),
+        "failures": 0,
+        "open_until": 0.0,
+        "negative": {},
+    }
+
+def note_key(text: str, lang: str):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest(), lang
+
+class TimeoutRequests:
+    """Stands in for the requests module of deep_translator: every request gets TRANSLATION_TIMEOUT."""
+    def __init__(self, module):
+        self.module = module
+
+    def __getattr__(self, name):
+        return getattr(self.module, name)
+
+    def get(self, *args, **kwargs):
+        kwargs.setdefault("timeout", TRANSLATION_TIMEOUT)
+        return self.module.get(*args, **kwargs)
+
+    def post(self, *args, **kwargs):
+        kwargs.setdefault("timeout", TRANSLATION_TIMEOUT)
+        return self.module.post(*args, **kwargs)
+
+def limit_translator_requests():
+    """deep_translator sends its requests without a timeout; a hanging connection would never end."""
+    try:
+        from deep_translator import google
+    except ImportError:
+        return
+    if not isinstance(google.requests, TimeoutRequests):
+        google.requests = TimeoutRequests(google.requests)
+
+def run_with_timeout(func, text: str, timeout: float):
+    """
+    Call func(text) on its own daemon thread and wait at most timeout seconds.
+    A call that does not return is abandoned with its thread, so it never blocks later calls.
+    """
+    future = Future()
+
+    def run():
+        try:
+            future.set_result(func(text))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name="slidejet-translate", daemon=True).start()
+    return future.result(timeout=timeout)
+
+def call_translator(func, text: str):
+    """
+    Call func(text) with a timeout, bounded retries with jittered backoff and a circuit breaker.
+    Raises TranslationError if no attempt succeeded.
+    """
+    guard = get_translation_guard()
+    error = None
+    for attempt in range(TRANSLATION_RETRIES + 1):
+        with guard["lock"]:
+            if time.monotonic() < guard["open_until"]:
+                raise TranslationError("Translation service unavailable (circuit open)")
+
+        count_translation("upstream")
+        try:
+            result = run_with_timeout(func, text, TRANSLATION_TIMEOUT)
+        except Exception as e:
+            error = e
+            with guard["lock"]:
+                guard["failures"] += 1
+                if guard["failures"] >= BREAKER_THRESHOLD:
+                    guard["open_until"] = time.monotonic() + BREAKER_COOLDOWN
+            if attempt < TRANSLATION_RETRIES:
+                time.sleep(random.uniform(0, TRANSLATION_BACKOFF * 2 ** attempt))
+        else:
+            with guard["lock"]:
+                guard["failures"] = 0
+                guard["open_until"] = 0.0
+            return result
+
+    raise TranslationError(f"Translation failed after {TRANSLATION_RETRIES + 1} attempts: {error!r}")
+
+# --- Single-flight coalescing ---
+@st.cache_resource
+def get_single_flight():
+    """
+    Process-wide registry of in-flight translations {(note_hash, lang): Future} and counters:
+    - leader: translations started by this process (cache lookups included)
+    - coalesced: callers that waited for an identical in-flight translation
+    - upstream: requests actually sent to the translator
+    - misses: translations not found in the translation cache
+    """
+    return {"lock": threading.Lock(), "in_flight": {}, "counters": {"leader": 0, "coalesced": 0, "upstream": 0, "misses": 0}}
+
+def count_translation(counter: str):
+    flights = get_single_flight()
+    with flights["lock"]:
+        flights["counters"][counter] += 1
+
+def translation_counters():
+    """Snapshot of the coalescing counters (see get_single_flight)."""
+    flights = get_single_flight()
+    with flights["lock"]:
+        return dict(flights["counters"], in_flight=len(flights["in_flight"]))
+
+def single_flight(key, func, *args, registry=None):
+    """
+    Run func(*args) at most once per key at a time. Concurrent callers with the same key wait
+    for the result (or exception) of the call that is already in flight. The registry (default:
+    the translations, see get_single_flight) holds the in-flight calls and the counters.
+    """
+    flights = get_single_flight() if registry is None else registry
+    with flights["lock"]:
+        future = flights["in_flight"].get(key)
+        leader = future is None
+        if leader:
+            future = Future()
+            flights["in_flight"][key] = future
+        flights["counters"]["leader" if leader else "coalesced"] += 1
+
+    if not leader:
+        return future.result()
+
+    try:
+        result = func(*args)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        with flights["lock"]:
+            del flights["in_flight"][key]
+
+def remember_failure(text: str, lang: str):
+    guard = get_translation_guard()
+    with guard["lock"]:
+        guard["negative"][note_key(text, lang)] = time.monotonic() + NEGATIVE_CACHE_TTL
+
+def translation_failed(text: str, lang: str):
+    """True if translating this note recently failed (negative cache, short TTL)."""
+    guard = get_translation_guard()
+    key = note_key(text, lang)
+    with guard["lock"]:
+        expiry = guard["negative"].get(key)
+        if expiry is None:
+            return False
+        if time.monotonic() >= expiry:
+            del guard["negative"][key]
+            return False
+        return True
+
+# --- Translation memory ---
+# Notes are split into sentences / bullet items ("segments"). Line breaks (\r, \n, \x0b),
+# bullet markers and surrounding whitespace are kept as "glue" and are never translated.
+LINE_BREAK_PATTERN = re.compile(r'(\r\n|[\r\n\x0b])')
+BULLET_PATTERN = re.compile(r'^\s*(?:(?:[-\u2013\u2022*\uf000-\uf8ff]|\d+[.)])\s+)?')
+SENTENCE_PATTERN = re.compile(r'(?<=[.!?])(\s+)(?=\S)')
+
+def split_note_segments(text: str):
+    """
+    Split notes into translatable segments and the glue between them.
+    Returns a list of (is_segment, part) tuples; joining all parts gives the original text.
+    """
+    parts = []
+    for line in LINE_BREAK_PATTERN.split(text):
+        if not line.strip():
+            # Line break or empty/whitespace-only line
+            if line:
+                parts.append((False, line))
+            continue
+
+        prefix = BULLET_PATTERN.match(line).group(0)
+        body = line[len(prefix):].rstrip()
+        suffix = line[len(prefix) + len(body):]
+        if prefix:
+            parts.append((False, prefix))
+        for i, piece in enumerate(SENTENCE_PATTERN.split(body)):
+            # re.split with a capture group alternates sentence / whitespace
+            parts.append((i % 2 == 0, piece))
+        if suffix:
+            parts.append((False, suffix))
+    return parts
+
+@st.cache_resource
+def get_translation_memory():
+    """
+    Process-wide translation memory shared by all sessions and decks.
+    - segments: {lang: {segment: translated_segment}}
+    - stats: {deck: {"requested": chars, "sent": chars}} (characters sent upstream per deck)
+    """
+    return {"lock": threading.Lock(), "segments": {}, "stats": {}}
+
+def translate_segments(segments: list, target_lang: str):
+    """
+    Translate a list of segments with as few requests as possible.
+    Segments are sent as one newline-separated text; if the translator does not return
+    the same number of lines, every segment is translated on its own.
+    Returns (translations, characters_sent).
+    """
+    from deep_translator import GoogleTranslator
+
+    limit_translator_requests()
+    translator = GoogleTranslator(source="auto", target=target_lang)
+
+    def _translate(text):
+        protected_text, replacements = protect_terms(text, target_lang)
+        return restore_terms(call_translator(translator.translate, protected_text), replacements)
+
+    joined = "\n".join(segments)
+    sent = len(joined)
+    lines = _translate(joined).split("\n") if len(segments) > 1 else [_translate(joined)]
+    if len(lines) != len(segments):
+        lines = [_translate(segment) for segment in segments]
+        sent += sum(len(segment) for segment in segments)
+    return [line.strip() for line in lines], sent
+
+def translate_with_memory(text: str, target_lang: str, deck: str | None = None):
+    """
+    Translate notes segment by segment. Only segments that are not yet in the translation
+    memory are sent to the translator; the notes are reassembled with their original structure.
+    """
+    memory = get_translation_memory()
+    parts = split_note_segments(text)
+
+    with memory["lock"]:
+        known = memory["segments"].setdefault(target_lang, {})
+        missing = list(dict.fromkeys(part for is_segment, part in parts if is_segment and part not in known))
+
+    sent = 0
+    if missing:
+        start = time.perf_counter()
+        try:
+            translations, sent = translate_segments(missing, target_lang)
+        finally:
+            record_timing("translation", {"deck": deck_label(deck), "lang": target_lang}, time.perf_counter() - start)
+        with memory["lock"]:
+            known.update(zip(missing, translations))
+
+    with memory["lock"]:
+        stats = memory["stats"].setdefault(deck or "", {"requested": 0, "sent": 0})
+        stats["requested"] += len(text)
+        stats["sent"] += sent
+        return "".join(known[part] if is_segment else part for is_segment, part in parts)
+
+@st.cache_data(show_spinner=False)
+def _translate_notes_cached(text: str, target_lang: str, deck: str | None = None):
+    # Only successful translations end up in the cache; failures raise
+    count_translation("misses")
+    return translate_with_memory(text, target_lang, deck)
+
+def translate_notes(text: str, target_lang: str | None, deck: str | None = None):
+    """
+    Translate notes into target_lang. If the translation fails, the original notes are
+    returned and the failure is kept in the short-lived negative cache (see translation_failed).
+    """
+    if not target_lang or translation_failed(text, target_lang):
+        return text
+    try:
+        # Identical concurrent requests (e.g. a whole lecture switching language) share one call
+        return single_flight(note_key(text, target_lang), _translate_notes_cached, text, target_lang, deck)
+    except Exception:
+        remember_failure(text, target_lang)
+        return text
+
+# --- Background translation for the slide viewer ---
+TRANSLATION_WAIT = 0.1            # seconds to wait for (cached) translations before rendering the placeholder
+TRANSLATION_POLL_INTERVAL = 0.5   # seconds between polls of the translated notes fragment
+
+@st.cache_resource
+def get_notes_executor():
+    """Process-wide worker pool that translates notes for the slide viewer."""
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="slidejet-notes")
+
+def remembered_translation(text: str, target_lang: str):
+    """The notes translated from the translation memory alone; None if a segment is not in the memory yet."""
+    memory = get_translation_memory()
+    with memory["lock"]:
+        known = memory["segments"].get(target_lang, {})
+        parts = split_note_segments(text)
+        if all(part in known for is_segment, part in parts if is_segment):
+            return "".join(known[part] if is_segment else part for is_segment, part in parts)
+    return None
+
+def submit_translation(text: str, target_lang: str, deck: str | None = None):
+    """
+    Translate notes in the background. Returns a Future with the result of translate_notes.
+    Known translations (and recent failures) are answered right away, so they never wait behind
+    slow translations in the worker pool.
+    """
+    if translation_failed(text, target_lang):
+        result = text
+    else:
+        result = remembered_translation(text, target_lang)
+        if result is not None:
+            count_translation("leader")   # a cache lookup (see get_single_flight)
+    if result is not None:
+        future = Future()
+        future.set_result(result)
+        return future
+
+    future = get_notes_executor().submit(translate_notes, text, target_lang, deck)
+    # Cached translations finish almost immediately, so the notes are rendered without polling
+    wait([future], timeout=TRANSLATION_WAIT)
+    return future
+
+def show_translated_notes(future, note_text: str, target_lang: str, lang_display: str, pending: bool):
+    """
+    Fragment body for the translated notes. While the translation is running, a placeholder is shown
+    and the fragment polls; once done, one full rerun renders the notes and stops the polling.
+    """
+    if not future.done():
+        st.info(f"Translating notes ({lang_display}) ...", icon=":material/translate:")
+        return
+    if pending:
+        st.rerun()
+
+    st.write(f"**Translated Notes** ({lang_display})\n\n{future.result()}")
+    if translation_failed(note_text, target_lang):
+        st.warning("The translation is currently not available, the original notes are shown. Please try again later.")
+
+# --- Prefetch translations of neighboring slides ---
+PREFETCH_AHEAD = 2      # next slides whose notes are translated in the background
+PREFETCH_BEHIND = 1     # previous slides (0 to disable)
+PREFETCH_WORKERS = 2    # per-process cap for concurrent prefetch translations
+
+@st.cache_resource
+def get_prefetch_executor():
+    """Process-wide worker pool for prefetching translations; its size caps concurrent prefetch translations."""
+    return ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="slidejet-prefetch")
+
+def prefetch_translations(state: dict, slides: list, slide_index: int, target_lang: str | None, deck: str | None = None):
+    """
+    Translate the notes of the slides around slide_index (1-based) in the background, so that they are
+    already in the translation cache when the user navigates there.
+    state is the per-session prefetch state {"lang": ..., "futures": {slide_index: Future}, "done": {slide_index}};
+    only pending futures are kept (finished translations are in the cache, not in the session), and
+    queued prefetches are cancelled when the language changes.
+    """
+    if state.get("lang") != target_lang:
+        for future in state.get("futures", {}).values():
+            future.cancel()
+        state["lang"] = target_lang
+        state["futures"] = {}
+        state["done"] = set()
+    if not target_lang:
+        return
+
+    futures = state["futures"]
+    for index, future in list(futures.items()):
+        if future.done():
+            del futures[index]
+            if not future.cancelled():
+                state["done"].add(index)
+
+    neighbors = [slide_index + i for i in range(1, PREFETCH_AHEAD + 1)] + [slide_index - i for i in range(1, PREFETCH_BEHIND + 1)]
+    for index in neighbors:
+        if 1 <= index <= len(slides) and index not in futures and index not in state["done"]:
+            futures[index] = get_prefetch_executor().submit(translate_notes, slides[index - 1]["notes"], target_lang, deck)
+
+# --- Slide image cache ---
+IMAGE_CACHE_BUDGET = 256 * 1024 * 1024   # bytes of slide images kept in memory (all sessions and decks)
+IMAGE_PREFETCH = 1                       # next/previous slides whose images are read ahead
+IMAGE_PREFETCH_WORKERS = 2               # per-process cap for concurrent image read-ahead
+
+@st.cache_resource
+def get_image_cache():
+    """Process-wide LRU cache of slide image bytes {(deck_reference, image_path): bytes} with hit statistics."""
+    return {"lock": threading.Lock(), "entries": OrderedDict(), "bytes": 0, "hits": 0, "misses": 0, "prefetched": 0}
+
+def read_slide_image(image_path: str, deck_ref: tuple, prefetch: bool = False):
+    """
+    Return the bytes of a slide image from the LRU cache, reading it from disk on a miss.
+    Entries are keyed by the deck reference, so a republished deck never gets stale images.
+    """
+    cache = get_image_cache()
+    key = (deck_ref, image_path)
+    with cache["lock"]:
+        data = cache["entries"].get(key)
+        if data is not None:
+            cache["entries"].move_to_end(key)
+            if not prefetch:
+                cache["hits"] += 1
+            return data
+
+    with open(image_path, "rb") as f:
+        data = f.read()
+
+    with cache["lock"]:
+        cache["prefetched" if prefetch else "misses"] += 1
+        if key not in cache["entries"]:
+            cache["entries"][key] = data
+            cache["bytes"] += len(data)
+        # Evict least recently used images, but always keep the one just read
+        while cache["bytes"] > IMAGE_CACHE_BUDGET and len(cache["entries"]) > 1:
+            _, evicted = cache["entries"].popitem(last=False)
+            cache["bytes"] -= len(evicted)
+    return data
+
+@st.cache_resource
+def get_image_prefetch_executor():
+    """Worker pool for image read-ahead, separate from the translation prefetch (which can wait on a slow translator)."""
+    return ThreadPoolExecutor(max_workers=IMAGE_PREFETCH_WORKERS, thread_name_prefix="slidejet-images")
+
+def prefetch_slide_images(slides: list, slide_index: int, img_folder: str, deck_ref: tuple):
+    """Read the images of the neighboring slides (slide_index is 1-based) into the image cache in the background."""
+    for index in range(slide_index - IMAGE_PREFETCH, slide_index + IMAGE_PREFETCH + 1):
+        if index != slide_index and 1 <= index <= len(slides):
+            image_path = os.path.join(img_folder, os.path.basename(slides[index - 1]["image"]))
+            get_image_prefetch_executor().submit(read_slide_image, image_path, deck_ref, True)
+
+STATIC_URL_PREFIX = "/app/static/"
+
+@st.cache_data(show_spinner=False, ttl=60)
+def static_files_exist(static_dir: str, urls: tuple):
+    """True if every static URL resolves to a file in static_dir (the folder Streamlit serves)."""
+    return all(url.startswith(STATIC_URL_PREFIX) and os.path.isfile(os.path.join(static_dir, url[len(STATIC_URL_PREFIX):]))
+               for url in urls)
+
+def use_static_images(slides):
+    """
+    True if the deck was published for static file serving (see SlideJet_convert), serving is enabled
+    and the images are in the static folder of the main script. A hub (or SlideJet_serve) in another
+    folder serves another static folder, then the images are read by the presenter instead.
+    """
+    if not (slides and all(slide.get("url") for slide in slides) and st.get_option("server.enableStaticServing")):
+        return False
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return False
+    static_dir = os.path.join(os.path.dirname(os.path.abspath(ctx.main_script_path)), "static")
+    return static_files_exist(static_dir, tuple(slide["url"] for slide in slides))
+
+def image_cache_stats():
+    """Snapshot of the image cache: entries, bytes, hits, misses, prefetched reads and hit rate."""
+    cache = get_image_cache()
+    with cache["lock"]:
+        requests = cache["hits"] + cache["misses"]
+        return {
+            "entries": len(cache["entries"]),
+            "bytes": cache["bytes"],
+            "hits": cache["hits"],
+            "misses": cache["misses"],
+            "prefetched": cache["prefetched"],
+            "hit_rate": cache["hits"] / requests if requests else 0.0,
+        }
+
+# --- Client-side slide navigator ---
+# A custom component (st.components.v2) that gets the slide URLs once, navigates in the browser
+# (buttons, keyboard, jump to slide), preloads the neighboring slides and reports the current
+# slide index back to Python after a short pause (debounced). Requires a deck published for
+# static file serving, see use_static_images.
+NAVIGATOR_PRELOAD = 2      # slides preloaded in each direction
+NAVIGATOR_DEBOUNCE = 400   # milliseconds without navigation before the slide index is reported
+
+NAVIGATOR_HTML = """
+<div class="sj-nav">
+  <button class="sj-prev" title="Previous slide (Left arrow)">&#9664;</button>
+  <span class="sj-position"><input class="sj-jump" type="number" min="1" step="1"> <span class="sj-count"></span></span>
+  <button class="sj-next" title="Next slide (Right arrow)">&#9654;</button>
+</div>
+<img class="sj-slide" alt="Slide">
+<div class="sj-hint">Use the arrow keys, Page Up/Down, Home and End to navigate.</div>
+"""
+
+NAVIGATOR_CSS = """
+.sj-nav { display: flex; justify-content: center; align-items: center; gap: 0.75rem; margin-bottom: 0.5rem; }
+.sj-nav button { border: 1px solid var(--st-border-color); border-radius: 0.5rem; background: var(--st-secondary-background-color);
+                 color: var(--st-text-color); padding: 0.25rem 0.9rem; cursor: pointer; }
+.sj-jump { width: 4rem; text-align: center; }
+.sj-slide { width: 100%; height: auto; display: block; }
+.sj-hint { font-size: 0.8rem; opacity: 0.6; text-align: center; margin-top: 0.25rem; }
+"""
+
+NAVIGATOR_JS = """
+export default function(component) {
+    const { data, parentElement, setStateValue } = component;
+    const slides = data.slides;
+    const img = parentElement.querySelector('.sj-slide');
+    const jump = parentElement.querySelector('.sj-jump');
+    const preloaded = {};
+    let index = data.index;
+    let reported = data.index;
+    let timer = null;
+
+    function preload(i) {
+        if (i >= 1 && i <= slides.length && !preloaded[i]) {
+            preloaded[i] = new Image();
+            preloaded[i].src = slides[i - 1];
+        }
+    }
+
+    function show(i) {
+        index = Math.min(Math.max(i, 1), slides.length);
+        img.src = slides[index - 1];
+        jump.value = index;
+        for (let d = 1; d <= data.preload; d++) { preload(index + d); preload(index - d); }
+        clearTimeout(timer);
+        timer = setTimeout(() => {
+            if (index !== reported) { reported = index; setStateValue('index', index); }
+        }, data.debounce);
+    }
+
+    function onKey(e) {
+        // Only keys on the page itself or on the navigator, other widgets (sliders, select boxes, ...) keep theirs
+        const target = e.composedPath()[0];
+        const onPage = target === document.body || target === document.documentElement;
+        if (target === jump || !(onPage || parentElement.contains(target))) return;
+        const moves = { ArrowRight: index + 1, PageDown: index + 1, ArrowLeft: index - 1, PageUp: index - 1, Home: 1, End: slides.length };
+        if (e.key in moves) { e.preventDefault(); show(moves[e.key]); }
+    }
+
+    parentElement.querySelector('.sj-count').textContent = `/ ${slides.length}`;
+    jump.max = slides.length;
+    parentElement.querySelector('.sj-prev').onclick = () => show(index - 1);
+    parentElement.querySelector('.sj-next').onclick = () => show(index + 1);
+    jump.onchange = () => show(parseInt(jump.value, 10) || index);
+    document.addEventListener('keydown', onKey);
+    show(index);
+
+    return () => { document.removeEventListener('keydown', onKey); clearTimeout(timer); };
+}
+"""
+
+@st.cache_resource
+def get_slide_navigator():
+    """Register the slide navigator component once per process. None if st.components.v2 is not available."""
+    try:
+        from streamlit.components.v2 import component
+    except ImportError:
+        return None
+    return component("slidejet_navigator", html=NAVIGATOR_HTML, css=NAVIGATOR_CSS, js=NAVIGATOR_JS)
+
+# --- PDF quality profiles ---
+# Slide images are downsampled to the profile's DPI at the size they are placed on the page and
+# re-encoded as JPEG, or as lossless palette PNG if the slide has at most 256 colors and the
+# profile allows it. "archive" embeds the original images.
+PDF_PROFILES = {
+    "screen": {"label": "Screen (small file, 96 dpi)", "dpi": 96, "quality": 70, "palette": False},
+    "print": {"label": "Print (150 dpi)", "dpi": 150, "quality": 85, "palette": True},
+    "archive": {"label": "Archive (original images)", "dpi": None},
+}
+PDF_DEFAULT_PROFILE = "print"
+PDF_IMAGE_WORKERS = 4                         # slide images processed in parallel (per process)
+PDF_TRANSLATION_WORKERS = 4                   # notes translated in parallel for PDFs (per process)
+PDF_PIPELINE_DEPTH = 8                        # slides prepared ahead of the PDF writer (per PDF)
+NOTES_IMAGE_BOX = (17 / 2.54, 17.99 / 2.54)   # inches for the slide in the notes PDF (A4, 2 cm margins, 30 % notes)
+PDF_SLIDE_WIDTH = 10                          # page width in inches of the PDF without notes (height: aspect ratio)
+PDF_PAGE_OVERHEAD = {True: 4000, False: 600}  # approximate bytes per page besides the image (with/without notes)
+
+@st.cache_resource
+def get_pdf_image_executor():
+    """Process-wide worker pool for the slide images of PDFs (Pillow releases the GIL while resampling and encoding)."""
+    return ThreadPoolExecutor(max_workers=PDF_IMAGE_WORKERS, thread_name_prefix="slidejet-pdf-image")
+
+@st.cache_resource
+def get_pdf_translation_executor():
+    """Process-wide worker pool that translates the notes of PDFs; its size caps concurrent requests to the translator."""
+    return ThreadPoolExecutor(max_workers=PDF_TRANSLATION_WORKERS, thread_name_prefix="slidejet-pdf-notes")
+
+def encode_pdf_image(image_path: str, profile: dict, box=None, output=None):
+    """
+    Downsamples a slide image for a quality profile and encodes it to output (a path or file object).
+    box is the placed size in inches (width, height); without box the image fills a page of
+    PDF_SLIDE_WIDTH inches. Returns the file extension of the encoding (".jpg" or ".png").
+    """
+    with Image.open(image_path) as img:
+        width_in, height_in = box or (PDF_SLIDE_WIDTH, PDF_SLIDE_WIDTH * img.height / img.width)
+        scale = min(width_in * profile["dpi"] / img.width, height_in * profile["dpi"] / img.height, 1.0)
+        size = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+        img = img.convert("RGB")
+        if size != img.size:
+            img = img.resize(size, Image.Resampling.LANCZOS)
+    # The DPI matches the page size of the PDF without notes (see pdf_page_image)
+    dpi = (img.width / width_in, img.height / height_in) if box is None else (profile["dpi"], profile["dpi"])
+    if profile["palette"] and img.getcolors(256) is not None:
+        img.quantize(colors=256, dither=Image.Dither.NONE).save(output, format="PNG", optimize=True, dpi=dpi)
+        return ".png"
+    img.save(output, format="JPEG", quality=profile["quality"], optimize=True, dpi=dpi)
+    return ".jpg"
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def estimate_slide_sizes(json_file: str, version: tuple, img_folder: str, profile_name: str, with_notes: bool):
+    """
+    Expected PDF bytes per slide for a profile: the image files for the original profile, otherwise
+    the average of up to three sample slides encoded with the profile; plus a per-page overhead for
+    text and layout. None if an image cannot be read.
+    """
+    slides = load_deck(json_file, version)
+    imgs = [os.path.join(img_folder, os.path.basename(slide["image"])) for slide in slides]
+    profile = PDF_PROFILES[profile_name]
+    try:
+        if profile["dpi"] is None:
+            image_sizes = [os.path.getsize(path) for path in imgs]
+        else:
+            box = NOTES_IMAGE_BOX if with_notes else None
+            samples = sorted({0, len(imgs) // 2, len(imgs) - 1})
+            encoded = 0
+            for i in samples:
+                buffer = io.BytesIO()
+                encode_pdf_image(imgs[i], profile, box, buffer)
+                encoded += len(buffer.getvalue())
+            image_sizes = [encoded / len(samples)] * len(imgs)
+    except OSError:
+        return None
+    return [int(size + PDF_PAGE_OVERHEAD[with_notes]) for size in image_sizes]
+
+@st.cache_resource
+def get_size_estimates():
+    """Process-wide background size estimates {(deck_ref, img_folder, profile, with_notes): Future}, least recently used last out."""
+    return {"lock": threading.Lock(), "futures": OrderedDict()}
+
+def submit_size_estimate(deck_ref, img_folder, profile_name: str, with_notes: bool):
+    """Future with the per-slide size estimate (see estimate_slide_sizes), computed once per deck version off the script thread."""
+    estimates = get_size_estimates()
+    key = (deck_ref, img_folder, profile_name, with_notes)
+    with estimates["lock"]:
+        future = estimates["futures"].get(key)
+        if future is None:
+            future = get_pdf_image_executor().submit(estimate_slide_sizes, deck_ref[0], deck_ref[1], img_folder, profile_name, with_notes)
+            estimates["futures"][key] = future
+            while len(estimates["futures"]) > 64:
+                estimates["futures"].popitem(last=False)
+        else:
+            estimates["futures"].move_to_end(key)
+    return future
+
+# --- PDF page cache ---
+# The pages of generated PDFs are kept in memory as standalone parts: the image XObject of a slide
+# (keyed by the content of the image, the profile and the layout) and the content streams of its
+# notes pages (keyed by the image, the notes and the language). A PDF of any slide selection or
+# language is assembled from cached parts (see write_pages_pdf) without rendering them again.
+PDF_PAGE_CACHE_BUDGET = 128 * 1024 * 1024   # bytes of page parts kept in memory (all sessions and decks)
+
+@st.cache_resource
+def get_pdf_page_cache():
+    """Process-wide LRU cache of PDF page parts {key: (part, bytes)} with hit statistics."""
+    return {"lock": threading.Lock(), "entries": OrderedDict(), "bytes": 0, "hits": 0, "misses": 0}
+
+def cached_page_part(key: tuple, build):
+    """
+    Returns a page part from the cache, building it on a miss. build() returns (part, size in bytes,
+    cacheable); parts that must not be kept (e.g. notes with a failed translation) are not stored.
+    """
+    cache = get_pdf_page_cache()
+    with cache["lock"]:
+        entry = cache["entries"].get(key)
+        if entry is not None:
+            cache["entries"].move_to_end(key)
+            cache["hits"] += 1
+            return entry[0]
+        cache["misses"] += 1
+
+    part, size, cacheable = build()
+
+    if cacheable:
+        with cache["lock"]:
+            if key not in cache["entries"]:
+                cache["entries"][key] = (part, size)
+                cache["bytes"] += size
+            while cache["bytes"] > PDF_PAGE_CACHE_BUDGET and len(cache["entries"]) > 1:
+                _, (_, evicted) = cache["entries"].popitem(last=False)
+                cache["bytes"] -= evicted
+    return part
+
+def page_part_cached(key: tuple):
+    """True if a page part is in the cache (does not count as a hit)."""
+    cache = get_pdf_page_cache()
+    with cache["lock"]:
+        return key in cache["entries"]
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def slide_image_hashes(json_file: str, version: tuple, img_folder: str):
+    """Content hash of each slide image of a deck, once per deck version (see file_reference)."""
+    hashes = []
+    for slide in load_deck(json_file, version):
+        try:
+            with open(os.path.join(img_folder, os.path.basename(slide["image"])), "rb") as f:
+                hashes.append(hashlib.sha256(f.read()).hexdigest())
+        except OSError:
+            hashes.append("missing")
+    return hashes
+
+def pdf_image_key(image_hash: str, profile_name: str, with_notes: bool):
+    return "image", image_hash, profile_name, with_notes
+
+def pdf_notes_key(slide: dict, image_key: tuple, trans_lan: str | None):
+    return "notes", image_key, hashlib.sha256(slide["notes"].encode("utf-8")).hexdigest(), trans_lan
+
+def pdf_page_image(image_path: str, image_hash: str, profile_name: str, with_notes: bool):
+    """
+    Cached image of a PDF page: dict with key, XObject entries and data (see pdf_image_xobject) and
+    the page size in points of the PDF without notes (PDF_SLIDE_WIDTH wide, for every profile). The
+    image is encoded for the quality profile (archive: the original file).
+    """
+    key = pdf_image_key(image_hash, profile_name, with_notes)
+
+    def build():
+        profile = PDF_PROFILES[profile_name]
+        if profile["dpi"] is None:
+            with open(image_path, "rb") as f:
+                data = f.read()
+        else:
+            buffer = io.BytesIO()
+            encode_pdf_image(image_path, profile, NOTES_IMAGE_BOX if with_notes else None, buffer)
+            data = buffer.getvalue()
+        entries, stream = pdf_image_xobject(data)
+        size = (PDF_SLIDE_WIDTH * 72, PDF_SLIDE_WIDTH * 72 * entries["Height"] / entries["Width"])
+        return {"key": key, "entries": entries, "data": stream, "size": size}, len(stream), True
+
+    return cached_page_part(key, build)
+
+def pdf_page_contents(slide: dict, image: dict, trans_lan: str | None, deck: str | None, with_notes: bool, translation=None):
+    """
+    Cached content streams of the pages of a slide: the full-page image, or the notes pages (see
+    notes_page_contents). translation is an optional Future with the result of translate_notes.
+    """
+    width, height = image["entries"]["Width"], image["entries"]["Height"]
+    if not with_notes:
+        return [b"q %.2f 0 0 %.2f 0 0 cm /Im0 Do Q" % image["size"]]
+    key = pdf_notes_key(slide, image["key"], trans_lan)
+
+    def build():
+        translated = None
+        if trans_lan:
+            translated = translation.result() if translation else translate_notes(slide["notes"], trans_lan, deck)
+        contents = notes_page_contents(slide["notes"], translated, trans_lan, width, height)
+        # Untranslated notes (translator unavailable) are not kept
+        cacheable = not (trans_lan and translation_failed(slide["notes"], trans_lan))
+        return contents, sum(len(content) for content in contents), cacheable
+
+    return cached_page_part(key, build)
+
+def pdf_page_cache_stats():
+    """Snapshot of the PDF page cache: entries, bytes, hits and misses."""
+    cache = get_pdf_page_cache()
+    with cache["lock"]:
+        return {"entries": len(cache["entries"]), "bytes": cache["bytes"], "hits": cache["hits"], "misses": cache["misses"]}
+
+# --- PDF artifact cache ---
+# Generated PDFs are kept on disk, keyed by the content of the deck (slide_data.json and images),
+# the language, the notes option, the quality profile and the slide selection, so they survive
+# restarts and are shared by all processes using the same folder. Least recently used PDFs are evicted above PDF_CACHE_BUDGET.
+# The folder is private to the user (set SLIDEJET_PDF_CACHE to use another one); cached PDFs are
+# served as they are, so a folder owned or writable by other users is not used (see pdf_cache_folder).
+PDF_CACHE_DIR = os.environ.get("SLIDEJET_PDF_CACHE") or os.path.join(
+    os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "slidejet", "pdf_cache")
+PDF_CACHE_BUDGET = 512 * 1024 * 1024   # bytes of PDFs kept on disk
+PDF_FORMAT = 5                         # increase when the PDF layout changes (invalidates the cache)
+
+@st.cache_resource
+def get_pdf_cache():
+    """Per-process state of the PDF cache: in-flight builds (see single_flight) and counters."""
+    return {"lock": threading.Lock(), "in_flight": {},
+            "counters": {"leader": 0, "coalesced": 0, "hits": 0, "builds": 0, "evictions": 0, "artifacts": 0}}
+
+def pdf_cache_folder():
+    """
+    PDF_CACHE_DIR, created with access for the user only if missing. None if it cannot be created
+    or is not safe to use: owned by another user or writable by others.
+    """
+    try:
+        os.makedirs(PDF_CACHE_DIR, mode=0o700, exist_ok=True)
+        folder_stat = os.stat(PDF_CACHE_DIR)
+    except OSError:
+        return None
+    if hasattr(os, "getuid") and (folder_stat.st_uid != os.getuid() or folder_stat.st_mode & 0o022):
+        return None
+    return PDF_CACHE_DIR
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def deck_content_hash(json_file: str, version: tuple, img_folder: str):
+    """Hash of slide_data.json and all slide images, once per deck version (see file_reference)."""
+    digest = hashlib.sha256()
+    with open(json_file, "rb") as f:
+        digest.update(f.read())
+    for image_hash in slide_image_hashes(json_file, version, img_folder):
+        digest.update(image_hash.encode("ascii"))
+    return digest.hexdigest()
+
+def selection_label(selection):
+    """Compact label of a slide selection, e.g. (1, 2, 3, 7) -> "1-3,7"."""
+    runs = []
+    for number in selection:
+        if runs and number == runs[-1][1] + 1:
+            runs[-1][1] = number
+        else:
+            runs.append([number, number])
+    return ",".join(str(first) if first == last else f"{first}-{last}" for first, last in runs)
+
+def pdf_file_name(pres_folder, trans_lan, with_notes=False, profile=PDF_DEFAULT_PROFILE, selection=None):
+    """
+    Download file name, e.g. Deck_with_notes_de.pdf or Deck_without_notes_slides_10-25_screen.pdf
+    (slide selection and profile if not the default).
+    """
+    pres_name = os.path.basename(os.path.normpath(pres_folder))
+    suffix = "" if profile == PDF_DEFAULT_PROFILE else f"_{profile}"
+    if selection:
+        suffix = f"_slides_{selection_label(selection).replace(',', '_')}{suffix}"
+    if with_notes:
+        return f"{pres_name}_with_notes_{trans_lan or 'original'}{suffix}.pdf"
+    return f"{pres_name}_without_notes{suffix}.pdf"
+
+def render_pdf(slides, image_hashes, img_folder, pres_folder, trans_lan, with_notes, output, progress=None, profile=PDF_DEFAULT_PROFILE):
+    """
+    Generates the PDF of slides (no PDF caching) into the binary file object output, with the
+    images of a quality profile (see PDF_PROFILES). The build is a pipeline: images are prepared
+    and notes translated in worker pools (only parts missing in the page cache) while the pages
+    are laid out and written in slide order, with at most PDF_PIPELINE_DEPTH slides in flight.
+    progress(stage, done, total) is called per written slide (see run_pdf_job).
+    """
+    in_flight = {}
+
+    def submit(i):
+        slide, image_hash = slides[i], image_hashes[i]
+        image = get_pdf_image_executor().submit(pdf_page_image, os.path.join(img_folder, os.path.basename(slide["image"])),
+                                                image_hash, profile, with_notes)
+        translation = None
+        if with_notes and trans_lan and not page_part_cached(pdf_notes_key(slide, pdf_image_key(image_hash, profile, with_notes), trans_lan)):
+            translation = get_pdf_translation_executor().submit(translate_notes, slide["notes"], trans_lan, pres_folder)
+        in_flight[i] = (image, translation)
+
+    def pages():
+        for i in range(min(PDF_PIPELINE_DEPTH, len(slides))):
+            submit(i)
+        for i, slide in enumerate(slides):
+            if i + PDF_PIPELINE_DEPTH < len(slides):
+                submit(i + PDF_PIPELINE_DEPTH)
+            image, translation = in_flight.pop(i)
+            image = image.result()
+            yield image, pdf_page_contents(slide, image, trans_lan, pres_folder, with_notes, translation)
+            if progress:
+                progress("Writing pages", i + 1, len(slides))
+
+    try:
+        write_pages_pdf(pages(), output, with_notes)
+    finally:
+        # Cancelled or failed build: drop the queued work
+        for futures in in_flight.values():
+            for future in futures:
+                if future:
+                    future.cancel()
+
+def store_pdf(tmp_path: str, path: str):
+    """Moves a built PDF into the cache (atomically) and evicts least recently used PDFs above the budget."""
+    os.replace(tmp_path, path)
+
+    entries = []
+    for entry in os.scandir(os.path.dirname(path)):
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue   # moved or evicted by another build since the listing
+        if entry.name.endswith(".pdf"):
+            entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        elif entry.name.endswith(".tmp") and time.time() - stat.st_mtime > 3600:
+            # Left over by an interrupted build
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+    total = sum(size for _, size, _ in entries)
+    cache = get_pdf_cache()
+    for _, size, entry_path in sorted(entries):
+        if total <= PDF_CACHE_BUDGET:
+            break
+        if entry_path == path:
+            continue
+        try:
+            os.remove(entry_path)
+        except OSError:
+            continue   # in use (Windows) or already evicted by another process
+        total -= size
+        with cache["lock"]:
+            cache["counters"]["evictions"] += 1
+
+def render_cached_pdf(path: str, slides, image_hashes, img_folder, pres_folder, trans_lan, with_notes, progress=None,
+                      profile=PDF_DEFAULT_PROFILE):
+    """
+    Builds a PDF into a temporary file of its own (next to the cache entry, so concurrent builds
+    never share a file) and moves it into the cache. Returns the PDF bytes. Without a writable
+    (safe) cache folder, the PDF is built in memory and not cached.
+    """
+    folder = pdf_cache_folder()
+    try:
+        if folder is None:
+            raise PermissionError(f"PDF cache folder {PDF_CACHE_DIR} is not usable")
+        tmp_file = tempfile.NamedTemporaryFile(dir=folder, suffix=".tmp", delete=False)
+    except OSError:
+        buffer = io.BytesIO()
+        render_pdf(slides, image_hashes, img_folder, pres_folder, trans_lan, with_notes, buffer, progress, profile)
+        return buffer.getvalue()
+
+    try:
+        with tmp_file:
+            render_pdf(slides, image_hashes, img_folder, pres_folder, trans_lan, with_notes, tmp_file, progress, profile)
+        with open(tmp_file.name, "rb") as f:
+            data = f.read()
+        # A PDF with untranslated notes (translator unavailable) is not kept
+        if trans_lan and any(translation_failed(slide["notes"], trans_lan) for slide in slides):
+            os.remove(tmp_file.name)
+        else:
+            store_pdf(tmp_file.name, path)
+    except BaseException:
+        if os.path.exists(tmp_file.name):
+            os.remove(tmp_file.name)
+        raise
+    return data
+
+def pdf_cache_path(deck_ref, img_folder, trans_lan, with_notes=False, profile=PDF_DEFAULT_PROFILE, selection=None):
+    """Path of a PDF in the on-disk cache (content key, see build_pdf)."""
+    trans_lan = trans_lan if with_notes else None   # the PDF without notes is the same in all languages
+    content = deck_content_hash(deck_ref[0], deck_ref[1], img_folder)
+    slides = selection_label(selection) if selection else ""
+    key = hashlib.sha256(f"{PDF_FORMAT}|{content}|{trans_lan or ''}|{int(with_notes)}|{profile}|{slides}".encode("utf-8")).hexdigest()[:32]
+    return os.path.join(PDF_CACHE_DIR, f"{key}.pdf")
+
+def read_cached_pdf(path: str):
+    """Bytes of a PDF in the cache (marked as most recently used), None if missing or the cache folder is not safe."""
+    if pdf_cache_folder() is None:
+        return None
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        os.utime(path)   # most recently used
+    except FileNotFoundError:
+        return None
+    return data
+
+def build_pdf(slides, deck_ref, img_folder, pres_folder, trans_lan, with_notes=False, progress=None, profile=PDF_DEFAULT_PROFILE,
+              selection=None):
+    """
+    Returns (file name, PDF bytes) of a deck from its pre-built PDFs or the on-disk PDF cache.
+    selection is a tuple of slide numbers (1-based) for a PDF of these slides only, None for all
+    slides. A missing PDF is built once (from the page cache, see render_pdf), concurrent requests
+    for the same PDF wait for that build.
+    """
+    trans_lan = trans_lan if with_notes else None
+    artifact = pdf_artifact(deck_ref, img_folder, trans_lan, with_notes, profile) if not selection else None
+    if artifact:
+        return pdf_file_name(pres_folder, trans_lan, with_notes, profile), read_pdf_artifact(artifact)
+    path = pdf_cache_path(deck_ref, img_folder, trans_lan, with_notes, profile, selection)
+    image_hashes = slide_image_hashes(deck_ref[0], deck_ref[1], img_folder)
+    if selection:
+        slides = [slides[number - 1] for number in selection]
+        image_hashes = [image_hashes[number - 1] for number in selection]
+    key = os.path.basename(path)
+    cache = get_pdf_cache()
+
+    def build():
+        data = read_cached_pdf(path)
+        hit = data is not None
+        if not hit:
+            start = time.perf_counter()
+            data = render_cached_pdf(path, slides, image_hashes, img_folder, pres_folder, trans_lan, with_notes, progress, profile)
+            record_timing("pdf_build", {"deck": deck_label(pres_folder), "lang": trans_lan or "original",
+                                        "notes": str(with_notes).lower(), "profile": profile}, time.perf_counter() - start)
+        with cache["lock"]:
+            cache["counters"]["hits" if hit else "builds"] += 1
+        return data
+
+    return pdf_file_name(pres_folder, trans_lan, with_notes, profile, selection), single_flight(key, build, registry=cache)
+
+def pdf_cache_stats():
+    """Snapshot of the PDF cache: entries and bytes on disk, hits, builds, coalesced requests, evictions and pre-built PDFs served."""
+    cache = get_pdf_cache()
+    entries = []
+    if pdf_cache_folder():
+        entries = [entry.stat().st_size for entry in os.scandir(PDF_CACHE_DIR) if entry.name.endswith(".pdf")]
+    with cache["lock"]:
+        counters = dict(cache["counters"])
+    return {"entries": len(entries), "bytes": sum(entries), "hits": counters["hits"], "builds": counters["builds"],
+            "coalesced": counters["coalesced"], "evictions": counters["evictions"], "artifacts": counters["artifacts"]}
+
+# --- Pre-built PDFs ---
+# SlideJet_convert can build the PDFs of a deck at conversion time. They are stored in the pdf
+# folder of the deck and listed in slide_data.json ({"slides": [...], "pdfs": [...]}) with the
+# notes option, language, profile and a hash of the notes and images they show. The presenter
+# serves them directly; missing or stale PDFs are generated on demand (see build_pdf).
+PDF_ARTIFACT_FOLDER = "pdf"
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def deck_source_hash(json_file: str, version: tuple, img_folder: str):
+    """Hash of the notes and slide images of a deck (what its PDFs show), once per deck version."""
+    digest = hashlib.sha256()
+    for slide, image_hash in zip(load_deck(json_file, version), slide_image_hashes(json_file, version, img_folder)):
+        digest.update(json.dumps([slide["notes"], image_hash]).encode("utf-8"))
+    return digest.hexdigest()
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def load_pdf_artifacts(json_file: str, version: tuple):
+    """Pre-built PDFs listed in slide_data.json (list of dicts with file, notes, language, profile and source)."""
+    with open(json_file, "r") as f:
+        data = json.load(f)
+    pdfs = data.get("pdfs", []) if isinstance(data, dict) else []
+    return [pdf for pdf in pdfs if isinstance(pdf, dict) and isinstance(pdf.get("file"), str)] if isinstance(pdfs, list) else []
+
+def pdf_artifact(deck_ref, img_folder, trans_lan, with_notes=False, profile=PDF_DEFAULT_PROFILE):
+    """Path of an up-to-date pre-built PDF of the whole deck, or None if there is none (or it is stale or missing)."""
+    trans_lan = trans_lan if with_notes else None
+    for pdf in load_pdf_artifacts(*deck_ref):
+        if (pdf.get("notes", False), pdf.get("language"), pdf.get("profile", PDF_DEFAULT_PROFILE)) != (with_notes, trans_lan, profile):
+            continue
+        path = os.path.join(os.path.dirname(deck_ref[0]), pdf["file"])
+        if pdf.get("source") == deck_source_hash(deck_ref[0], deck_ref[1], img_folder) and os.path.isfile(path):
+            return path
+    return None
+
+def read_pdf_artifact(path: str):
+    """Bytes of a pre-built PDF, counted in the PDF cache statistics."""
+    with open(path, "rb") as f:
+        data = f.read()
+    cache = get_pdf_cache()
+    with cache["lock"]:
+        cache["counters"]["artifacts"] += 1
+    return data
+
+def build_pdf_artifacts(json_file: str, img_folder: str, pres_folder: str, languages=(), profile=PDF_DEFAULT_PROFILE, progress=None):
+    """
+    Builds the PDFs of a deck into its pdf folder (for SlideJet_convert): without notes, with the
+    original notes and with the notes translated into each language. Returns (records for the
+    "pdfs" list of slide_data.json, languages skipped because the translation failed).
+    progress(done, total) is called after each PDF.
+    """
+    deck_ref = file_reference(json_file)
+    slides = load_deck(*deck_ref)
+    image_hashes = slide_image_hashes(deck_ref[0], deck_ref[1], img_folder)
+    source = deck_source_hash(deck_ref[0], deck_ref[1], img_folder)
+    folder = os.path.join(os.path.dirname(deck_ref[0]), PDF_ARTIFACT_FOLDER)
+    os.makedirs(folder, exist_ok=True)
+
+    records, skipped = [], []
+    variants = [(None, False), (None, True)] + [(lang, True) for lang in languages]
+    for i, (lang, with_notes) in enumerate(variants):
+        name = pdf_file_name(pres_folder, lang, with_notes, profile)
+        path = os.path.join(folder, name)
+        with open(path + ".tmp", "wb") as f:
+            render_pdf(slides, image_hashes, img_folder, pres_folder, lang, with_notes, f, profile=profile)
+        # A PDF with untranslated notes (translator unavailable) is not kept
+        if lang and any(translation_failed(slide["notes"], lang) for slide in slides):
+            os.remove(path + ".tmp")
+            skipped.append(lang)
+        else:
+            os.replace(path + ".tmp", path)
+            records.append({"file": f"{PDF_ARTIFACT_FOLDER}/{name}", "notes": with_notes, "language": lang,
+                            "profile": profile, "source": source})
+        if progress:
+            progress(i + 1, len(variants))
+    return records, skipped
+
+# --- Background PDF jobs ---
+# PDFs are built on a bounded, process-wide worker pool; further requests wait in submission
+# order (first come, first served). Sessions poll the progress of their job, which is shared by
+# all sessions requesting the same PDF and cancelled once no session waits for it any more.
+PDF_WORKERS = 2          # PDFs built at the same time (per process)
+PDF_POLL_INTERVAL = 1    # seconds between progress updates in the browser
+PDF_JOB_ABANDON = 30     # seconds without a poll after which a session no longer waits for a job
+PDF_JOB_TTL = 600        # seconds a finished job is kept for downloads (its PDF stays in the PDF cache)
+
+class PdfCancelled(Exception):
+    """Raised inside a PDF build that no session waits for any more."""
+
+@st.cache_resource
+def get_pdf_jobs():
+    """Process-wide PDF worker pool and jobs {(deck_ref, img_folder, lang, with_notes, profile, selection): job}."""
+    return {"lock": threading.Lock(), "jobs": {}, "sequence": itertools.count(),
+            "executor": ThreadPoolExecutor(max_workers=PDF_WORKERS, thread_name_prefix="slidejet-pdf")}
+
+def pdf_job_abandoned(job: dict):
+    # Caller holds the jobs lock
+    now = time.monotonic()
+    return not any(now - last_poll < PDF_JOB_ABANDON for last_poll in job["sessions"].values())
+
+def expire_pdf_jobs(jobs: dict):
+    # Caller holds the jobs lock
+    now = time.monotonic()
+    for job_key, job in list(jobs["jobs"].items()):
+        if job["finished"] and now - job["finished"] > PDF_JOB_TTL:
+            del jobs["jobs"][job_key]
+
+def pdf_job_evicted(job: dict):
+    """True if the job finished but its PDF has left the cache since (it has to be built again)."""
+    return job["state"] == "done" and job["result"][1] is not None and not os.path.isfile(job["result"][1])
+
+def submit_pdf_job(session: str, slides, deck_ref, img_folder, pres_folder, trans_lan, with_notes=False,
+                   profile=PDF_DEFAULT_PROFILE, selection=None):
+    """Requests a PDF for a session; joins an active or recently finished job for the same PDF. Returns the job key."""
+    jobs = get_pdf_jobs()
+    key = (deck_ref, img_folder, trans_lan, with_notes, profile, selection)
+    with jobs["lock"]:
+        now = time.monotonic()
+        expire_pdf_jobs(jobs)
+        job = jobs["jobs"].get(key)
+        if job is None or job["state"] in ("failed", "cancelled") or pdf_job_evicted(job):
+            job = {"state": "queued", "stage": "Waiting", "done": 0, "total": len(selection or slides), "result": None,
+                   "error": None, "sessions": {}, "seq": next(jobs["sequence"]), "finished": None}
+            jobs["jobs"][key] = job
+            jobs["executor"].submit(run_pdf_job, job, slides, deck_ref, img_folder, pres_folder, trans_lan, with_notes, profile, selection)
+        job["sessions"][session] = now
+    return key
+
+def run_pdf_job(job: dict, slides, deck_ref, img_folder, pres_folder, trans_lan, with_notes, profile, selection):
+    """
+    Worker: builds the PDF of a job (via the PDF cache) and records progress and result. The result is
+    (file name, path in the PDF cache, None); only a PDF that could not be cached (e.g. untranslated
+    notes) is kept in the job as (file name, None, bytes).
+    """
+    jobs = get_pdf_jobs()
+
+    def progress(stage, done, total):
+        with jobs["lock"]:
+            job.update(stage=stage, done=done, total=total)
+            if pdf_job_abandoned(job):
+                raise PdfCancelled()
+
+    try:
+        with jobs["lock"]:
+            if pdf_job_abandoned(job):
+                raise PdfCancelled()
+            job.update(state="running", stage="Starting")
+        file_name, data = build_pdf(slides, deck_ref, img_folder, pres_folder, trans_lan, with_notes, progress, profile, selection)
+        path = pdf_cache_path(deck_ref, img_folder, trans_lan, with_notes, profile, selection)
+        result = (file_name, path, None) if pdf_cache_folder() and os.path.isfile(path) else (file_name, None, data)
+        state, error = "done", None
+    except PdfCancelled:
+        result, state, error = None, "cancelled", None
+    except Exception as e:
+        result, state, error = None, "failed", str(e)
+    with jobs["lock"]:
+        job.update(state=state, result=result, error=error, finished=time.monotonic())
+
+def poll_pdf_job(key, session: str):
+    """Snapshot of a job for a session (marks the session as still waiting), with its queue position; None if unknown."""
+    jobs = get_pdf_jobs()
+    with jobs["lock"]:
+        expire_pdf_jobs(jobs)
+        job = jobs["jobs"].get(key)
+        if job is None:
+            return None
+        if job["state"] in ("queued", "running"):
+            job["sessions"][session] = time.monotonic()
+        ahead = sum(1 for other in jobs["jobs"].values() if other["state"] == "queued" and other["seq"] < job["seq"])
+        return {**job, "sessions": len(job["sessions"]), "ahead": ahead}
+
+def cancel_pdf_job(key, session: str):
+    """The session no longer waits for the job; the build stops if no other session waits for it."""
+    jobs = get_pdf_jobs()
+    with jobs["lock"]:
+        job = jobs["jobs"].get(key)
+        if job is not None:
+            job["sessions"].pop(session, None)
+
+def show_pdf_job(jobs_key: str, slot, session: str, text: str, pending: bool):
+    """
+    Fragment body for the PDF job of a download slot (st.session_state[jobs_key][slot]): queue
+    position or progress while the job is active (the fragment polls), then the download button.
+    Once finished (or cancelled), one full rerun stops the polling.
+    """
+    key = st.session_state[jobs_key].get(slot)
+    job = poll_pdf_job(key, session) if key else None
+    active = job is not None and job["state"] in ("queued", "running")
+    if not active and pending:
+        st.rerun()
+    if job is None:
+        return
+
+    if job["state"] == "queued":
+        st.progress(0.0, text=f"Waiting for a free PDF worker ({job['ahead']} PDFs ahead) ...")
+    elif job["state"] == "running":
+        st.progress(job["done"] / max(job["total"], 1), text=f"{job['stage']} ({job['done']} of {job['total']})")
+    elif job["state"] == "done":
+        filename, path, PDFbyte = job["result"]
+        if pdf_job_evicted(job):
+            # Evicted from the PDF cache since the job finished, Prepare starts a new build
+            st.session_state[jobs_key].pop(slot, None)
+            st.info("The PDF is no longer in the cache, please prepare it again.")
+            return
+        st.download_button(
+            label=text,
+            data=functools.partial(read_job_pdf, path) if path else PDFbyte,
+            file_name=filename,
+            mime='application/octet-stream',
+            icon=':material/download:',
+            type='primary'
+        )
+    elif job["state"] == "failed":
+        st.error(f"The PDF could not be generated: {job['error']}")
+    else:
+        st.info("The PDF generation was cancelled.")
+
+    if active:
+        st.button("Cancel", key=f"{jobs_key}_cancel_{slot}", on_click=cancel_download, args=(jobs_key, slot, session))
+
+def read_job_pdf(path: str):
+    """Download data of a finished job: the PDF from the cache, read when the download starts."""
+    data = read_cached_pdf(path)
+    if data is None:
+        raise FileNotFoundError(f"The PDF {os.path.basename(path)} is no longer in the cache.")
+    return data
+
+def cancel_download(jobs_key: str, slot, session: str):
+    """Cancel button callback: forget the job of the slot and stop waiting for it."""
+    key = st.session_state[jobs_key].pop(slot, None)
+    if key:
+        cancel_pdf_job(key, session)
+
+# --- PDF writer ---
+# Writes PDFs from cached pages (see get_pdf_page_cache) straight into the output. Slide images
+# are embedded as stored (JPEG as DCT stream, PNG with its compressed IDAT data, like img2pdf
+# does) and each image once. In the notes PDF the notes are text on an optional content layer
+# ("Speaker notes") that PDF viewers can hide; notes longer than the space below the slide
+# continue on text pages. Basic markdown in the notes is rendered: **bold**, *italic*, list items
+# and headings (see wrap_notes).
+NOTES_PAGE_SIZE = (595.28, 841.89)   # A4 in points
+NOTES_MARGIN = 56.69                 # 2 cm
+NOTES_HEIGHT_RATIO = 0.3             # fraction of the page (inside the margins) for the notes
+NOTES_GAP = 14.17                    # 0.5 cm between slide and notes
+NOTES_FONT_SIZE = 11
+NOTES_LEADING = 16
+NOTES_INDENT = 14.17                 # 0.5 cm hanging indent of list items
+NOTES_FONTS = {"/F1": "Helvetica", "/F2": "Helvetica-Bold", "/F3": "Helvetica-Oblique", "/F4": "Helvetica-BoldOblique"}
+NOTES_STYLE_FONTS = {(False, False): "/F1", (True, False): "/F2", (False, True): "/F3", (True, True): "/F4"}   # (bold, italic)
+EMPHASIS_PATTERN = re.compile(
+    r"\*\*\*(?=\S)(?P<bi>.+?)(?<=\S)\*\*\*|\*\*(?=\S)(?P<b>.+?)(?<=\S)\*\*|\*(?=\S)(?P<i>.+?)(?<=\S)\*"
+    r"|(?<!\w)___(?=\S)(?P<bi_>.+?)(?<=\S)___(?!\w)|(?<!\w)__(?=\S)(?P<b_>.+?)(?<=\S)__(?!\w)|(?<!\w)_(?=\S)(?P<i_>.+?)(?<=\S)_(?!\w)")
+LIST_ITEM_PATTERN = re.compile(r'^\s*(?:([-*+\u2013\u2022\uf000-\uf8ff])|(\d+[.)]))\s+')
+HEADING_PATTERN = re.compile(r'^\s*#{1,6}\s+')
+
+def png_xobject(data: bytes):
+    """Image XObject (entries, stream) with the IDAT data of a PNG, or None if the PNG cannot be passed through."""
+    pos, idat, palette, header = 8, [], None, None
+    while pos + 8 <= len(data):
+        length, chunk_type = struct.unpack(">I4s", data[pos:pos + 8])
+        chunk = data[pos + 8:pos + 8 + length]
+        if chunk_type == b"IHDR":
+            header = struct.unpack(">IIBBBBB", chunk)
+        elif chunk_type == b"PLTE":
+            palette = chunk
+        elif chunk_type in (b"tRNS", b"iCCP"):
+            return None   # transparency or color profile: decoded instead
+        elif chunk_type == b"IDAT":
+            idat.append(chunk)
+        elif chunk_type == b"IEND":
+            break
+        pos += 12 + length
+    if header is None:
+        return None
+    width, height, depth, color_type, _, _, interlace = header
+    colors = {0: 1, 2: 3, 3: 1}.get(color_type)
+    if colors is None or interlace or depth > 8 or (color_type == 2 and depth != 8) or (color_type == 3 and not palette):
+        return None
+    if color_type == 3:
+        colorspace = f"[/Indexed /DeviceRGB {len(palette) // 3 - 1} <{palette.hex()}>]"
+    else:
+        colorspace = "/DeviceGray" if colors == 1 else "/DeviceRGB"
+    entries = {"Width": width, "Height": height, "ColorSpace": colorspace, "BitsPerComponent": depth,
+               "Filter": "/FlateDecode",
+               "DecodeParms": f"<< /Predictor 15 /Colors {colors} /BitsPerComponent {depth} /Columns {width} >>"}
+    return entries, b"".join(idat)
+
+def pdf_image_xobject(data: bytes):
+    """
+    Image XObject (entries, stream) of the bytes of a slide image. JPEGs (gray or RGB) and PNGs up
+    to 8 bit without transparency or interlacing are embedded without re-encoding, other images
+    are decoded and compressed.
+    """
+    if data[:3] == b"\xff\xd8\xff":
+        with Image.open(io.BytesIO(data)) as img:
+            if img.mode in ("L", "RGB"):
+                return {"Width": img.width, "Height": img.height, "BitsPerComponent": 8, "Filter": "/DCTDecode",
+                        "ColorSpace": "/DeviceGray" if img.mode == "L" else "/DeviceRGB"}, data
+    elif data[:8] == b"\x89PNG\r\n\x1a\n":
+        xobject = png_xobject(data)
+        if xobject:
+            return xobject
+    with Image.open(io.BytesIO(data)) as img:
+        img = img.convert("RGB")
+        return {"Width": img.width, "Height": img.height, "ColorSpace": "/DeviceRGB", "BitsPerComponent": 8,
+                "Filter": "/FlateDecode"}, zlib.compress(img.tobytes())
+
+def emphasis_runs(text: str, bold: bool = False):
+    """Splits text with markdown emphasis (**bold**, *italic*, ***both***, also with _) into runs (font, text)."""
+    runs, pos = [], 0
+    for match in EMPHASIS_PATTERN.finditer(text):
+        name = match.lastgroup
+        runs.append((NOTES_STYLE_FONTS[bold, False], text[pos:match.start()]))
+        runs.append((NOTES_STYLE_FONTS[bold or "b" in name, "i" in name], match.group(name)))
+        pos = match.end()
+    runs.append((NOTES_STYLE_FONTS[bold, False], text[pos:]))
+    return [(font, part) for font, part in runs if part]
+
+def wrap_runs(runs: list, width: float):
+    """Breaks runs (font, text) into lines (lists of runs) that fit the width; words wider than a line are broken."""
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+
+    def measure(word):
+        return sum(stringWidth(part, NOTES_FONTS[font], NOTES_FONT_SIZE) for font, part in word)
+
+    def split_word(word):
+        pieces, piece, used = [], [], 0.0
+        for font, part in word:
+            for char in part:
+                char_width = stringWidth(char, NOTES_FONTS[font], NOTES_FONT_SIZE)
+                if piece and used + char_width > width:
+                    pieces.append(piece)
+                    piece, used = [], 0.0
+                piece.append((font, char))
+                used += char_width
+        return pieces + [piece]
+
+    # Words are lists of runs, so emphasis can start or end inside a word (e.g. "**bold**,")
+    words, word = [], []
+    for font, text in runs:
+        for i, part in enumerate(text.split(" ")):
+            if i > 0 and word:
+                words.append(word)
+                word = []
+            if part:
+                word.append((font, part))
+    if word:
+        words.append(word)
+
+    space = stringWidth(" ", NOTES_FONTS["/F1"], NOTES_FONT_SIZE)
+    lines, line, used = [], [], 0.0
+    for word in words:
+        for piece in (split_word(word) if measure(word) > width else [word]):
+            piece_width = measure(piece)
+            if line and used + space + piece_width > width:
+                lines.append(line)
+                line, used = [], 0.0
+            if line:
+                # The space takes the font of the words around it, between different fonts the regular one
+                line.append((piece[0][0] if line[-1][0] == piece[0][0] else "/F1", " "))
+                used += space
+            line += piece
+            used += piece_width
+    lines.append(line)
+
+    merged = []
+    for line in lines:
+        runs = []
+        for font, part in line:
+            if runs and runs[-1][0] == font:
+                runs[-1] = (font, runs[-1][1] + part)
+            else:
+                runs.append((font, part))
+        merged.append(runs)
+    return merged
+
+def wrap_notes(text: str, width: float):
+    """
+    Splits notes into lines (marker, indent, runs) that fit the width. Line breaks of the notes are
+    kept; list items get a bullet (or their number) and a hanging indent, headings are bold.
+    """
+    lines = []
+    for paragraph in LINE_BREAK_PATTERN.split(text):
+        if LINE_BREAK_PATTERN.fullmatch(paragraph):
+            continue
+        marker, indent, bold = None, 0.0, False
+        heading, item = HEADING_PATTERN.match(paragraph), LIST_ITEM_PATTERN.match(paragraph)
+        if heading:
+            paragraph, bold = paragraph[heading.end():], True
+        elif item:
+            paragraph, marker, indent = paragraph[item.end():], item.group(2) or "\u2022", NOTES_INDENT
+        for i, runs in enumerate(wrap_runs(emphasis_runs(paragraph, bold), width - indent)):
+            lines.append((marker if i == 0 else None, indent, runs))
+    return lines
+
+def notes_text(lines: list, x: float, top: float):
+    """Content stream operators for notes lines (marker, indent, runs) starting at baseline top, on the notes layer."""
+    def show(font, text):
+        escaped = text.encode("cp1252", errors="replace").replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+        return font.encode() + b" %d Tf (" % NOTES_FONT_SIZE + escaped + b") Tj"
+
+    ops = [b"/OC /oc1 BDC", b"BT", b"%.2f TL" % NOTES_LEADING, b"%.2f %.2f Td" % (x, top)]
+    for marker, indent, runs in lines:
+        if marker:
+            ops.append(show("/F1", marker))
+        if indent:
+            ops.append(b"%.2f 0 Td" % indent)
+        ops += [show(font, text) for font, text in runs]
+        ops.append(b"T*")
+        if indent:
+            ops.append(b"%.2f 0 Td" % -indent)
+    ops += [b"ET", b"EMC"]
+    return b"\n".join(ops)
+
+def notes_page_contents(notes: str, translated: str | None, trans_lan: str | None, width: int, height: int):
+    """
+    Content streams of the notes PDF pages of a slide: the slide image (/Im0, width x height pixels)
+    in the upper part and the translated and original notes below, continued on text pages.
+    """
+    page_width, page_height = NOTES_PAGE_SIZE
+    box_width = page_width - 2 * NOTES_MARGIN
+    box_height = (page_height - 2 * NOTES_MARGIN) * (1 - NOTES_HEIGHT_RATIO)
+    text_top = page_height - NOTES_MARGIN - NOTES_FONT_SIZE
+    lines_per_page = int((text_top - NOTES_MARGIN) // NOTES_LEADING) + 1
+
+    scale = min(box_width / width, box_height / height)
+    draw_width, draw_height = width * scale, height * scale
+    x = NOTES_MARGIN + (box_width - draw_width) / 2
+    y = page_height - NOTES_MARGIN - draw_height
+
+    lines = []
+    if trans_lan:
+        lines += [(None, 0, [("/F2", f"Translated Notes ({trans_lan})")])]
+        lines += wrap_notes(translated, box_width) + [(None, 0, [])]
+    lines += [(None, 0, [("/F2", "Original Notes:")])] + wrap_notes(notes, box_width)
+
+    top = y - NOTES_GAP - NOTES_FONT_SIZE
+    fit = max(0, int((top - NOTES_MARGIN) // NOTES_LEADING) + 1)
+    image = b"q %.2f 0 0 %.2f %.2f %.2f cm /Im0 Do Q\n" % (draw_width, draw_height, x, y)
+    contents = [image + notes_text(lines[:fit], NOTES_MARGIN, top)]
+    for start in range(fit, len(lines), lines_per_page):
+        contents.append(notes_text(lines[start:start + lines_per_page], NOTES_MARGIN, text_top))
+    return contents
+
+def pdf_dict(entries: dict):
+    return ("<< " + " ".join(f"/{key} {value}" for key, value in entries.items()) + " >>").encode()
+
+def write_pdf_object(writer: dict, number: int, body: bytes, stream: bytes | None = None):
+    """Writes an indirect object (with an optional stream) and records its offset for the xref table."""
+    writer["offsets"][number] = writer["pos"]
+    chunk = b"%d 0 obj\n" % number + body
+    if stream is not None:
+        chunk += b"\nstream\n" + stream + b"\nendstream"
+    chunk += b"\nendobj\n"
+    writer["out"].write(chunk)
+    writer["pos"] += len(chunk)
+
+def write_pdf_image(writer: dict, image: dict):
+    """Writes the XObject of a cached page image (see pdf_page_image) once per PDF; returns its object number."""
+    if image["key"] not in writer["images"]:
+        number = writer["next"]
+        writer["next"] += 1
+        write_pdf_object(writer, number, pdf_dict({"Type": "/XObject", "Subtype": "/Image", **image["entries"],
+                                                   "Length": len(image["data"])}), image["data"])
+        writer["images"][image["key"]] = number
+    return writer["images"][image["key"]]
+
+def write_pdf_page(writer: dict, content: bytes, size: tuple, image_number=None):
+    """Writes a page (content stream, optional slide image XObject /Im0) and adds it to the page list."""
+    resources = {}
+    if writer["notes"]:
+        resources["Font"] = "<< " + " ".join(f"{name} {number} 0 R" for number, name in enumerate(NOTES_FONTS, 4)) + " >>"
+        resources["Properties"] = "<< /oc1 3 0 R >>"
+    if image_number is not None:
+        resources["XObject"] = f"<< /Im0 {image_number} 0 R >>"
+    content_number, page_number = writer["next"], writer["next"] + 1
+    writer["next"] += 2
+    write_pdf_object(writer, content_number, pdf_dict({"Length": len(content)}), content)
+    write_pdf_object(writer, page_number, pdf_dict({
+        "Type": "/Page", "Parent": "2 0 R", "MediaBox": "[0 0 %.2f %.2f]" % size,
+        "Resources": pdf_dict(resources).decode(), "Contents": f"{content_number} 0 R"}))
+    writer["pages"].append(page_number)
+
+def write_pages_pdf(pages, output, notes: bool = False):
+    """
+    Assembles a PDF from pages (image, contents) into the binary file object output: image is a
+    cached page image (see pdf_page_image), contents the content streams of the slide's pages
+    (the first one draws the image). Notes PDFs are A4 with the notes layer and fonts, otherwise
+    each page has the size of its image.
+    """
+    # Objects 1-2: catalog and page tree (written last), 3: notes layer, 4 and up: fonts
+    writer = {"out": output, "pos": 0, "offsets": {}, "next": 4 + len(NOTES_FONTS) if notes else 3, "pages": [], "images": {}, "notes": notes}
+    header = b"%PDF-1.5\n%\xe2\xe3\xcf\xd3\n"
+    output.write(header)
+    writer["pos"] = len(header)
+    if notes:
+        write_pdf_object(writer, 3, b"<< /Type /OCG /Name (Speaker notes) >>")
+        for number, font in enumerate(NOTES_FONTS.values(), 4):
+            write_pdf_object(writer, number, pdf_dict({"Type": "/Font", "Subtype": "/Type1", "BaseFont": f"/{font}",
+                                                        "Encoding": "/WinAnsiEncoding"}))
+
+    for image, contents in pages:
+        size = NOTES_PAGE_SIZE if notes else image["size"]
+        write_pdf_page(writer, contents[0], size, write_pdf_image(writer, image))
+        for content in contents[1:]:
+            write_pdf_page(writer, content, size)
+
+    kids = " ".join(f"{number} 0 R" for number in writer["pages"])
+    write_pdf_object(writer, 2, f"<< /Type /Pages /Kids [{kids}] /Count {len(writer['pages'])} >>".encode())
+    layers = b" /OCProperties << /OCGs [3 0 R] /D << /Order [3 0 R] >> >>" if notes else b""
+    write_pdf_object(writer, 1, b"<< /Type /Catalog /Pages 2 0 R" + layers + b" >>")
+
+    xref = [b"xref\n0 %d\n0000000000 65535 f \n" % writer["next"]]
+    xref += [b"%010d 00000 n \n" % writer["offsets"][number] for number in range(1, writer["next"])]
+    output.write(b"".join(xref) + b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (writer["next"], writer["pos"]))
+
+# --- Startup warm-up ---
+# Optional per deck, configured in the YAML, e.g.
+#   warmup:
+#     images: true          # read all slide images into the image cache
+#     languages: [de, fr]   # translate the notes into these languages
+#     pdf: true             # build the PDFs without and with notes (original notes and languages)
+# (warmup: true uses the defaults). Runs once per process in a background thread, started by
+# SlideJet_serve.py when the server starts or by the first rerun of the deck's presenter.
+WARMUP_DEFAULTS = {"images": True, "languages": [], "pdf": False}
+
+@st.cache_resource
+def get_warmup_state():
+    """Per-process warm-up state: status dict per YAML file (resolved path)."""
+    return {"lock": threading.Lock(), "decks": {}}
+
+def warmup_settings(config: dict):
+    """Warm-up settings of a deck config (dict with WARMUP_DEFAULTS keys) or None if disabled."""
+    warmup = config.get("warmup", False)
+    if warmup is False:
+        return None
+    return {**WARMUP_DEFAULTS, **(warmup if isinstance(warmup, dict) else {})}
+
+def start_warmup(yaml_file: str):
+    """
+    Starts the warm-up of a deck in a background thread, once per process and YAML file.
+    Returns the status dict of the warm-up or None if the deck does not configure one.
+    """
+    state = get_warmup_state()
+    yaml_file = os.path.realpath(yaml_file)
+    with state["lock"]:
+        if yaml_file in state["decks"]:
+            return state["decks"][yaml_file]
+        try:
+            settings = warmup_settings(load_config(*file_reference(yaml_file)))
+        except (OSError, yaml.YAMLError, ValueError):
+            settings = None   # the presenter reports configuration errors
+        if settings is None:
+            state["decks"][yaml_file] = None
+            return None
+        status = {"yaml": yaml_file, "state": "running", "step": "configuration", "done": 0, "total": 0,
+                  "skipped": [], "error": None, "started": time.time(), "finished": None}
+        state["decks"][yaml_file] = status
+    threading.Thread(target=run_warmup, args=(yaml_file, settings, status), daemon=True,
+                     name=f"slidejet-warmup-{os.path.basename(yaml_file)}").start()
+    return status
+
+def run_warmup(yaml_file: str, settings: dict, status: dict):
+    """Loads the deck into the shared caches: slides, images, translations and PDFs (see start_warmup)."""
+    def step(name):
+        status["step"] = name
+        status["done"] += 1
+
+    try:
+        config = load_config(*file_reference(yaml_file))
+        pres_folder = config["presentation_folder"]
+        img_folder = os.path.join(pres_folder, "images")
+        deck_ref = file_reference(os.path.join(pres_folder, "slide_data.json"))
+        slides = load_deck(*deck_ref)
+        languages = settings["languages"]
+        pdfs = [(None, False), (None, True)] + [(lang, True) for lang in languages] if settings["pdf"] else []
+        status["deck"] = pres_folder
+        status["total"] = 1 + len(slides) * (bool(settings["images"]) + len(languages)) + len(pdfs)
+        step("slides")
+
+        if settings["images"]:
+            for slide in slides:
+                image_path = os.path.join(img_folder, os.path.basename(slide["image"]))
+                try:
+                    read_slide_image(image_path, deck_ref, prefetch=True)
+                except OSError:
+                    status["skipped"].append(image_path)
+                step("images")
+
+        for lang in languages:
+            for slide in slides:
+                translate_notes(slide["notes"], lang, pres_folder)
+                step(f"translations ({lang})")
+
+        for lang, with_notes in pdfs:
+            if lang and any(translation_failed(slide["notes"], lang) for slide in slides):
+                # Not cached with untranslated notes; built on request once the translator is back
+                status["skipped"].append(f"pdf ({lang})")
+            else:
+                # On the PDF worker pool, so the warm-up respects the PDF concurrency limit
+                get_pdf_jobs()["executor"].submit(build_pdf, slides, deck_ref, img_folder, pres_folder, lang, with_notes).result()
+            step(f"pdf ({lang or 'original'}, {'with' if with_notes else 'without'} notes)")
+        status["state"] = "done"
+    except Exception as e:
+        status["state"] = "failed"
+        status["error"] = str(e)
+    status["finished"] = time.time()
+
+def warmup_status():
+    """Snapshot of all warm-ups of this process (JSON-serializable), keyed by YAML file."""
+    state = get_warmup_state()
+    with state["lock"]:
+        return {yaml_file: {**status, "skipped": list(status["skipped"])}
+                for yaml_file, status in state["decks"].items() if status is not None}
+
+# --- Performance instrumentation ---
+# Each run of the presenter script times its phases (config, slides, image, notes, downloads and
+# the whole run); requests to the translator and PDF builds are timed as well. The timings are
+# kept per process as count, sum and max per deck (and language) and shown, together with the
+# cache counters, in the performance panel: ?perf=1 in the URL or performance_panel: true in the
+# YAML. With the panel enabled, every run - the full run or a fragment rerun (e.g. when navigating)
+# - is also logged as one JSON line (logger "slidejet.perf").
+# perf_snapshot (JSON) and perf_prometheus (Prometheus text format) export the metrics,
+# SlideJet_serve.py serves the latter at /slidejet/metrics.
+PERF_QUERY_PARAM = "perf"
+PERF_PANEL_REFRESH = 2   # seconds
+PERF_TIMINGS = {
+    "phase": "Phases of the presenter script per deck",
+    "translation": "Requests to the translator per deck and language",
+    "pdf_build": "PDF builds per deck, language, notes option and profile",
+}
+PERF_COUNTERS = {
+    "image_cache": ("hits", "misses", "prefetched"),
+    "translations": ("leader", "coalesced", "upstream", "misses"),
+    "pdf_cache": ("hits", "builds", "coalesced", "evictions", "artifacts"),
+    "pdf_pages": ("hits", "misses"),
+}
+
+perf_logger = logging.getLogger("slidejet.perf")
+if not perf_logger.handlers:
+    _perf_handler = logging.StreamHandler()
+    _perf_handler.setFormatter(logging.Formatter("%(message)s"))
+    perf_logger.addHandler(_perf_handler)
+    perf_logger.setLevel(logging.INFO)
+    perf_logger.propagate = False
+
+@st.cache_resource
+def get_perf_metrics():
+    """Process-wide timings {(kind, labels): {"count", "sum", "max"}} in seconds, kinds see PERF_TIMINGS."""
+    return {"lock": threading.Lock(), "timings": {}}
+
+def deck_label(pres_folder):
+    """Short deck name for the metrics: the name of the presentation folder."""
+    return os.path.basename(os.path.normpath(pres_folder)) if pres_folder else "-"
+
+def record_timing(kind: str, labels: dict, seconds: float):
+    metrics = get_perf_metrics()
+    with metrics["lock"]:
+        entry = metrics["timings"].setdefault((kind, tuple(labels.items())), {"count": 0, "sum": 0.0, "max": 0.0})
+        entry["count"] += 1
+        entry["sum"] += seconds
+        entry["max"] = max(entry["max"], seconds)
+
+@contextlib.contextmanager
+def perf_phase(keys: dict, phase: str):
+    """Times a phase of the presenter script, per deck and in the timings of the session's current run."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        record_timing("phase", {"deck": deck_label(st.session_state.get(keys["presentation_folder"])), "phase": phase}, seconds)
+        st.session_state.setdefault(keys["perf_run"], {})[phase] = round(seconds * 1000, 2)
+
+@contextlib.contextmanager
+def perf_script_run(keys: dict, phase: str):
+    """
+    Times the outermost part of a script run: the full run or a fragment rerun (navigating, changing the language).
+    Each such run starts new timings for the session and logs them as one line when done (if enabled).
+    """
+    depth = st.session_state.get(keys["perf_depth"], 0)
+    if not depth:
+        st.session_state[keys["perf_run"]] = {}
+    st.session_state[keys["perf_depth"]] = depth + 1
+    try:
+        with perf_phase(keys, phase):
+            yield
+    finally:
+        st.session_state[keys["perf_depth"]] = depth
+        if not depth and st.session_state.get(keys["perf_enabled"]):
+            log_perf_run(keys, phase)
+
+def perf_enabled(config: dict):
+    """True if the performance panel is enabled by the query parameter or the YAML."""
+    return st.query_params.get(PERF_QUERY_PARAM, "").lower() in ("1", "true") or config.get("performance_panel", False)
+
+def perf_snapshot():
+    """All timings and cache counters of this process (JSON-serializable)."""
+    metrics = get_perf_metrics()
+    with metrics["lock"]:
+        timings = [{"kind": kind, "labels": dict(labels), **entry} for (kind, labels), entry in metrics["timings"].items()]
+    return {
+        "time": round(time.time(), 3),
+        "timings": sorted(timings, key=lambda timing: (timing["kind"], -timing["sum"] / timing["count"])),
+        "image_cache": image_cache_stats(),
+        "translations": translation_counters(),
+        "pdf_cache": pdf_cache_stats(),
+        "pdf_pages": pdf_page_cache_stats(),
+    }
+
+def prometheus_labels(labels: dict):
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for value in labels.values())
+    return "{" + ",".join(f'{key}="{value}"' for key, value in zip(labels, escaped)) + "}" if labels else ""
+
+def perf_prometheus(snapshot: dict | None = None):
+    """The metrics of perf_snapshot in the Prometheus text format."""
+    snapshot = snapshot or perf_snapshot()
+    lines = []
+    for kind, description in PERF_TIMINGS.items():
+        name = f"slidejet_{kind}_seconds"
+        timings = [timing for timing in snapshot["timings"] if timing["kind"] == kind]
+        lines += [f"# HELP {name} {description}", f"# TYPE {name} summary"]
+        for timing in timings:
+            lines.append(f"{name}_count{prometheus_labels(timing['labels'])} {timing['count']}")
+            lines.append(f"{name}_sum{prometheus_labels(timing['labels'])} {timing['sum']:.6f}")
+        lines += [f"# HELP {name}_max Longest duration: {description}", f"# TYPE {name}_max gauge"]
+        lines += [f"{name}_max{prometheus_labels(timing['labels'])} {timing['max']:.6f}" for timing in timings]
+
+    for group, counters in PERF_COUNTERS.items():
+        name = f"slidejet_{group}_total"
+        lines += [f"# HELP {name} Counters of the {group.replace('_', ' ')}", f"# TYPE {name} counter"]
+        lines += [f"{name}{prometheus_labels({'counter': counter})} {snapshot[group][counter]}" for counter in counters]
+    for group in ("image_cache", "pdf_cache", "pdf_pages"):
+        lines += [f"# HELP slidejet_{group}_bytes Size of the {group.replace('_', ' ')}", f"# TYPE slidejet_{group}_bytes gauge",
+                  f"slidejet_{group}_bytes {snapshot[group]['bytes']}"]
+    return "\n".join(lines) + "\n"
+
+def log_perf_run(keys: dict, run: str = "run"):
+    """Logs the timings of the session's last run (full run or fragment rerun) as one JSON line."""
+    perf_logger.info(json.dumps({
+        "event": "slidejet_run",
+        "run": run,
+        "time": round(time.time(), 3),
+        "deck": deck_label(st.session_state.get(keys["presentation_folder"])),
+        "session": st.session_state.get(keys["session_id"]),
+        "language": st.session_state.get(keys["language"]),
+        "slide": st.session_state.get(keys["slide_index"]),
+        "phases_ms": st.session_state.get(keys["perf_run"], {}),
+    }, ensure_ascii=False))
+
+def show_perf_panel(keys: dict):
+    """
+    Performance panel: timings of the last run, slowest decks and languages, cache counters and exports.
+    Rendered as a fragment refreshed every PERF_PANEL_REFRESH seconds, so it follows the fragment reruns.
+    """
+    with st.expander(":grey[Performance]", expanded=True):
+        run = st.session_state.get(keys["perf_run"], {})
+        st.caption("Last run: " + ", ".join(f"{phase} {ms:.0f} ms" for phase, ms in run.items()))
+        snapshot = perf_snapshot()
+        st.dataframe([{"kind": timing["kind"], "labels": ", ".join(f"{key}={value}" for key, value in timing["labels"].items()),
+                       "count": timing["count"], "avg ms": round(timing["sum"] / timing["count"] * 1000, 1),
+                       "max ms": round(timing["max"] * 1000, 1)} for timing in snapshot["timings"]],
+                     hide_index=True, width="stretch")
+
+        image_stats = snapshot["image_cache"]
+        st.caption(f"Slide images: {image_stats['entries']} cached ({image_stats['bytes'] / 1024**2:.1f} MB), "
+                   f"hit rate {image_stats['hit_rate']:.0%} ({image_stats['hits']} hits, {image_stats['misses']} misses, "
+                   f"{image_stats['prefetched']} prefetched)")
+        translations = snapshot["translations"]
+        st.caption(f"Translations: {translations['leader'] - translations['misses']} cache hits, {translations['misses']} misses, "
+                   f"{translations['coalesced']} waited for a running translation, {translations['upstream']} translator requests")
+        pdf_stats = snapshot["pdf_cache"]
+        st.caption(f"PDFs: {pdf_stats['entries']} cached ({pdf_stats['bytes'] / 1024**2:.1f} MB), {pdf_stats['hits']} hits, "
+                   f"{pdf_stats['builds']} builds, {pdf_stats['coalesced']} waited for a running build, "
+                   f"{pdf_stats['evictions']} evicted, {pdf_stats['artifacts']} pre-built served")
+        page_stats = snapshot["pdf_pages"]
+        st.caption(f"PDF pages: {page_stats['entries']} parts cached ({page_stats['bytes'] / 1024**2:.1f} MB), "
+                   f"{page_stats['hits']} hits, {page_stats['misses']} misses")
+        warmup = warmup_status().get(os.path.realpath(st.session_state[keys["config_source"]] or ""))
+        if warmup:
+            st.caption(f"Warm-up: {warmup['state']}, {warmup['done']} of {warmup['total']} steps ({warmup['step']})"
+                       + (f", skipped: {', '.join(warmup['skipped'])}" if warmup["skipped"] else "")
+                       + (f", error: {warmup['error']}" if warmup["error"] else ""))
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button("Metrics (JSON)", data=lambda: json.dumps(perf_snapshot(), indent=2),
+                               file_name="slidejet_metrics.json", mime="application/json", icon=":material/download:")
+        with col2:
+            st.download_button("Metrics (Prometheus)", data=perf_prometheus, file_name="slidejet_metrics.prom",
+                               mime="text/plain", icon=":material/download:")
+
+# --- DICTIONARY ---
+
+protected_terms = {
+    "de": {
+        "SlideJet": "SlideJet",
+        "PowerPoint": "PowerPoint",
+        "Streamlit": "Streamlit",
+        "Python": "Python"
+    },
+    "fr": {
+        "SlideJet": "SlideJet",
+        "PowerPoint": "PowerPoint",
+        "Streamlit": "Streamlit",
+        "Python": "Python"
+    },
+    "it": {
+        "SlideJet": "SlideJet",
+        "PowerPoint": "PowerPoint",
+        "Streamlit": "Streamlit",
+        "Python": "Python"
+    },
+    "hi": {
+        "SlideJet": "SlideJet",
+        "PowerPoint": "PowerPoint",
+        "Streamlit": "Streamlit",
+        "Python": "Python"
+    },
+    # Extend for other languages
+}
+
+# --- Language selection ---
+languages = {
+    "🇬🇧 English": "en",
+    "🇪🇸 Spanish": "es",
+    "🇫🇷 French": "fr",
+    "🇩🇪 German": "de",
+    "🇮🇹 Italian": "it",
+    "🇸🇪 Swedish": "sv",
+    "🇩🇰 Danish": "da",
+    "🇳🇴 Norwegian": "no",
+    "🇷🇺 Russian": "ru",
+    "🇨🇳 Chinese (Simplified)": "zh-CN",
+    "🇮🇳 Hindi": "hi",
+    "🇧🇩 Bengali": "bn",
+    "🇺🇾 Urdu": "ur",    
+    "🇦🇪 Arabic": "ar",
+    "🇯🇵 Japanese": "ja",
+    "🇰🇷 Korean": "ko",
+    "🇻🇳 Vietnamese": "vi",
+    "🇹🇷 Turkish": "tr",
+    "🇵🇹 Portuguese": "pt",
+    "🇵🇱 Polish": "pl",
+    "🇳🇱 Dutch": "nl", 
+    "🇮🇩 Indonesian": "id",
+    "🇹🇭 Thai": "th",
+}
+
+language_names = ["🌐 Original Notes"] + list(languages.keys())
+
+# --- USER INTERFACE ---
+
+def session_keys(app_id: str):
+    """Session state keys of a presentation, namespaced by app_id (several decks can share a session)."""
+    names = ["reset_mode", "config", "slide_data", "presentation_folder", "images_folder", "header_text",
+             "subheader_text", "default_yaml", "prefetch", "config_source", "language", "navigator",
+             "slide_index", "slide_number", "session_id", "pdf_jobs", "pdf_profile", "pdf_range", "perf_run",
+             "perf_depth", "perf_enabled", "downloads_lang"]
+    return {name: f"{app_id}_{name}" for name in names}
+
+def upload_config(keys: dict, label: str):
+    """File uploader for a SlideJet YAML; stores the validated config in the session."""
+    uploaded_yaml = st.file_uploader(label, type=["yaml", "yml"])
+    if uploaded_yaml is None:
+        return False
+    try:
+        st.session_state[keys["config"]] = yaml.safe_load(uploaded_yaml)
+        validate_config(st.session_state[keys["config"]])
+        st.session_state[keys["config_source"]] = None
+    except yaml.YAMLError as e:
+        st.error(f"YAML parsing error: {e}")
+        st.stop()
+    except ValueError as e:
+        st.error(str(e))
+        st.stop()
+    return True
+
+def load_presentation_config(default_yaml: str, keys: dict):
+    """Returns the configuration of the presentation (default YAML, uploaded YAML or hot reload)."""
+    # --- Initialize reset mode ---
+    if keys["reset_mode"] not in st.session_state:
+        st.session_state[keys["reset_mode"]] = False
+
+    if keys["default_yaml"] not in st.session_state:
+        st.session_state[keys["default_yaml"]] = default_yaml
+
+    if keys["config_source"] not in st.session_state:
+        st.session_state[keys["config_source"]] = None
+
+    # --- Hot reload: a republished YAML is picked up on the next rerun (cached per file version) ---
+    if st.session_state.get(keys["config"]) is not None and st.session_state[keys["config_source"]]:
+        try:
+            st.session_state[keys["config"]] = load_config(*file_reference(st.session_state[keys["config_source"]]))
+        except (OSError, yaml.YAMLError, ValueError) as e:
+            # Keep the last valid configuration while the file is being replaced
+            st.warning(f"The presentation configuration could not be reloaded: {e}")
+
+    # --- Configuration loading / depending if it's the start or a reset ---
+    if st.session_state.get(keys["config"]) is None:
+
+        if st.session_state[keys["reset_mode"]]:
+            # User wants to load a new YAML, show uploader
+            st.session_state[keys["config"]] = None
+            st.warning("Please upload a new SlideJet YAML file. Alternatively, you can use the Default YAML again.")
+
+            if upload_config(keys, "Upload your slidejet_config.yaml"):
+                st.session_state[keys["reset_mode"]] = False  # Done loading new config
+                st.rerun()  # Restart to apply
+
+            col1, col2, col3 = st.columns((1,1,1))
+            with col2:
+                if st.button("🔄 Use Default YAML again"):
+                    try:
+                        st.session_state[keys["config"]] = load_config(*file_reference(st.session_state[keys["default_yaml"]]))
+                        st.session_state[keys["config_source"]] = st.session_state[keys["default_yaml"]]
+                        st.session_state[keys["reset_mode"]] = False
+                        st.success("Default YAML loaded.")
+                        st.rerun()
+                    except Exception as e:
+                        st.error(f"Error loading default YAML: {e}")
+                        st.stop()
+
+        else:
+            # Normal start: Try to load default YAML
+            if os.path.exists(default_yaml):
+                st.session_state[keys["config"]] = load_config(*file_reference(default_yaml))
+                st.session_state[keys["config_source"]] = default_yaml
+            else:
+                st.warning("No default YAML found. Please upload a SlideJet YAML file.")
+                upload_config(keys, "Upload your slidejet_config.yaml")
+
+        if st.session_state[keys["config"]] is None:
+            st.stop()
+
+    config = st.session_state[keys["config"]]
+    # Store the config values into specific session keys
+    if st.session_state.get(keys["presentation_folder"]) != config["presentation_folder"]:
+        st.session_state[keys["images_folder"]] = os.path.join(config["presentation_folder"], "images")
+    st.session_state[keys["presentation_folder"]] = config["presentation_folder"]
+    st.session_state[keys["header_text"]] = config["header_text"]
+    st.session_state[keys["subheader_text"]] = config["subheader_text"]
+    return config
+
+def load_presentation_slides(keys: dict):
+    """Returns the slides of the presentation (shared by all sessions) or None if they are not loaded yet."""
+    # --- Initialize session state ---
+    if keys["slide_data"] not in st.session_state:
+        st.session_state[keys["slide_data"]] = None
+    if st.session_state.get(keys["images_folder"]) is None:
+        st.session_state[keys["images_folder"]] = os.path.join(st.session_state[keys["presentation_folder"]], "images")
+
+    # --- Load slides ---
+    JSON_file = os.path.join(st.session_state[keys["presentation_folder"]], "slide_data.json")
+
+    if os.path.exists(JSON_file):
+        # The session only keeps a reference, the slides are shared by all sessions.
+        # The reference is renewed on every rerun, so a republished deck is swapped in.
+        deck_ref = file_reference(JSON_file)
+        if st.session_state[keys["slide_data"]] is not None and st.session_state[keys["slide_data"]] != deck_ref:
+            st.toast("The presentation was updated.", icon=":material/sync:")
+        st.session_state[keys["slide_data"]] = deck_ref
+    elif st.session_state[keys["slide_data"]] is None:
+        if upload_config(keys, "**Default presentation not found.** This likely happens if the path to the files is corrupt or missing. Please upload your slidejet_config.yaml file."):
+            config = st.session_state[keys["config"]]
+            st.session_state[keys["presentation_folder"]] = config["presentation_folder"]
+            st.session_state[keys["images_folder"]] = os.path.join(config["presentation_folder"], "images")
+            st.session_state[keys["header_text"]] = config.get("header_text", "Presentation Title")
+            st.session_state[keys["subheader_text"]] = config.get("subheader_text", "Subtitle")
+
+            JSON_file = os.path.join(st.session_state[keys["presentation_folder"]], "slide_data.json")
+            try:
+                st.session_state[keys["slide_data"]] = file_reference(JSON_file)
+
+                # This belongs in the SUCCESS block
+                first_image = load_deck(*st.session_state[keys["slide_data"]])[0]["image"]
+                image_path = os.path.join(st.session_state[keys["images_folder"]], os.path.basename(first_image))
+                if not os.path.exists(image_path):
+                    st.warning(f"Image `{image_path}` not found. Please check your images folder.")
+
+            except Exception as e:
+                st.error(f"Error loading slide_data.json: {e}")
+                st.stop()
+
+    try:
+        return load_deck(*st.session_state[keys["slide_data"]]) if st.session_state[keys["slide_data"]] else None
+    except (OSError, ValueError) as e:
+        st.error(f"Error loading slide_data.json: {e}")
+        st.stop()
+
+# --- Slide viewer ---
+# The viewer and the notes are fragments: navigating only reruns the viewer,
+# changing the language reruns the notes and then the app (the downloads depend on the language).
+@st.fragment
+def show_slide_viewer(slides, keys: dict, client_navigation=True):
+    with perf_script_run(keys, "viewer"):
+        num_slides = len(slides)
+        navigator = get_slide_navigator() if client_navigation and use_static_images(slides) else None
+
+        if navigator:
+            # Navigation happens in the browser, only the (debounced) slide index comes back
+            result = navigator(
+                key=keys["navigator"],
+                data={"slides": [slide["url"] for slide in slides], "index": st.session_state[keys["slide_index"]],
+                      "preload": NAVIGATOR_PRELOAD, "debounce": NAVIGATOR_DEBOUNCE},
+                default={"index": st.session_state[keys["slide_index"]]},
+                on_index_change=lambda: None,
+            )
+            st.session_state[keys["slide_index"]] = min(max(int(result.index or 1), 1), num_slides)
+            show_notes(slides, st.session_state[keys["slide_index"]], keys)
+            return
+
+        lc, cc, rc = st.columns((1,3,1))
+        with cc:
+            st.session_state[keys["slide_index"]] = st.number_input(f'**Select slide to show** (1–{num_slides})', 1, num_slides, key=keys["slide_number"])
+
+        selected_slide = slides[st.session_state[keys["slide_index"]] - 1]
+        image_path = os.path.join(st.session_state[keys["images_folder"]], os.path.basename(selected_slide["image"]))
+        with perf_phase(keys, "image"):
+            if use_static_images(slides):
+                # Content-hashed static URL: the browser caches the slide, the server sends no image bytes
+                st.image(selected_slide["url"])
+            else:
+                try:
+                    st.image(read_slide_image(image_path, st.session_state[keys["slide_data"]]))
+                except FileNotFoundError:
+                    st.warning(f"Image `{image_path}` not found. Please check your images folder.")
+                prefetch_slide_images(slides, st.session_state[keys["slide_index"]], st.session_state[keys["images_folder"]], st.session_state[keys["slide_data"]])
+
+        show_notes(slides, st.session_state[keys["slide_index"]], keys)
+
+@st.fragment
+def show_notes(slides, slide_index, keys: dict):
+    with perf_script_run(keys, "notes"):
+        selected_lang_display = st.selectbox("**Speaker notes can be translated.** Please choose the language:", options=language_names, key=keys["language"])
+        target_lang = None if selected_lang_display == "🌐 Original Notes" else languages[selected_lang_display]
+        deck = st.session_state[keys["presentation_folder"]]
+        if st.session_state.get(keys["downloads_lang"], target_lang) != target_lang:
+            # The downloads below the viewer are outside this fragment, they need the new language too
+            st.session_state[keys["downloads_lang"]] = target_lang
+            st.rerun(scope="app")
+
+        # Translate the notes of the next (and previous) slides in the background
+        if keys["prefetch"] not in st.session_state:
+            st.session_state[keys["prefetch"]] = {}
+        prefetch_translations(st.session_state[keys["prefetch"]], slides, slide_index, target_lang, deck)
+
+        note_text = slides[slide_index - 1]["notes"]
+        if target_lang:
+            # Slide and original notes render immediately, the translation fills in when finished
+            future = submit_translation(note_text, target_lang, deck)
+            pending = not future.done()
+            st.fragment(show_translated_notes, run_every=TRANSLATION_POLL_INTERVAL if pending else None)(
+                future, note_text, target_lang, selected_lang_display, pending)
+            deck_stats = get_translation_memory()["stats"].get(deck)
+            if deck_stats and deck_stats["requested"]:
+                st.caption(f"Translation memory: {deck_stats['sent']:,} of {deck_stats['requested']:,} characters of this presentation were sent for translation.")
+            with st.expander("Show original notes", expanded=pending):
+                st.write(note_text)
+        else:
+            st.write(f"**Notes:**\n\n{note_text}")
+
+def show_size_caption(artifacts: dict, estimates: dict, selection, pending: bool):
+    """
+    Fragment body for the expected file sizes: exact for pre-built PDFs, otherwise the per-slide
+    estimates (see submit_size_estimate) summed for the selected slides. While an estimate is
+    running the fragment polls; once done, one full rerun stops the polling.
+    """
+    if not all(future.done() for future in estimates.values()):
+        return
+    if pending:
+        st.rerun()
+
+    sizes = []
+    for with_notes in (True, False):
+        if artifacts[with_notes]:
+            sizes.append(os.path.getsize(artifacts[with_notes]))
+            continue
+        slide_sizes = estimates[with_notes].result()
+        if slide_sizes is None:
+            return
+        sizes.append(sum(slide_sizes[number - 1] for number in selection) if selection else sum(slide_sizes))
+    st.caption(f"Expected file size: about {sizes[0] / 1024**2:.1f} MB with notes, {sizes[1] / 1024**2:.1f} MB without notes.")
+
+def show_downloads(slides, keys: dict):
+    """PDF download buttons below the slide viewer."""
+    # The language is chosen inside the notes fragment; downloads use the current choice
+    # (changing it reruns the app, see show_notes)
+    selected_lang_display = st.session_state.get(keys["language"], "🌐 Original Notes")
+    target_lang = None if selected_lang_display == "🌐 Original Notes" else languages[selected_lang_display]
+    st.session_state[keys["downloads_lang"]] = target_lang
+
+    # --- Download buttons ---
+    st.markdown('---')
+    st.markdown(""" 
+    #### Download:
+    _Subsequently you can generate a PDF file :green[with] or :orange[without] notes for download. After selection, the file will be generated and subsequently provided for local download._
+""")
+    if keys["session_id"] not in st.session_state:
+        st.session_state[keys["session_id"]] = uuid.uuid4().hex
+    if keys["pdf_jobs"] not in st.session_state:
+        st.session_state[keys["pdf_jobs"]] = {}
+    session = st.session_state[keys["session_id"]]
+    pdf_jobs = st.session_state[keys["pdf_jobs"]]
+    deck = (slides, st.session_state[keys["slide_data"]], st.session_state[keys["images_folder"]], st.session_state[keys["presentation_folder"]])
+
+    profile = st.radio("PDF quality", options=list(PDF_PROFILES), index=list(PDF_PROFILES).index(PDF_DEFAULT_PROFILE),
+                       format_func=lambda name: PDF_PROFILES[name]["label"], horizontal=True, key=keys["pdf_profile"])
+    selection = None
+    if len(slides) > 1:
+        first, last = st.slider("Slides", min_value=1, max_value=len(slides), value=(1, len(slides)), key=keys["pdf_range"])
+        if (first, last) != (1, len(slides)):
+            selection = tuple(range(first, last + 1))
+    artifacts, estimates = {}, {}
+    for with_notes in (True, False):
+        lang = target_lang if with_notes else None
+        artifacts[with_notes] = pdf_artifact(deck[1], deck[2], lang, with_notes, profile) if not selection else None
+        if not artifacts[with_notes]:
+            estimates[with_notes] = submit_size_estimate(deck[1], deck[2], profile, with_notes)
+    pending = not all(future.done() for future in estimates.values())
+    st.fragment(show_size_caption, run_every=PDF_POLL_INTERVAL if pending else None)(artifacts, estimates, selection, pending)
+
+    # PDFs are built in the background (see submit_pdf_job), the page stays usable meanwhile
+    pcol1, pcol2, pcol3 = st.columns([5, 1, 5])
+    downloads = [(pcol1, True, 'Prepare pdf :green[(**with notes**)] for download', 'Download pdf (with notes)'),
+                 (pcol3, False, 'Prepare pdf :orange[(**without notes**)] for download', 'Download PDF')]
+    for col, with_notes, label, text in downloads:
+        with col:
+            lang = target_lang if with_notes else None
+            if artifacts[with_notes]:
+                # Pre-built by SlideJet_convert: served directly, read only when clicked
+                st.download_button(
+                    label=text,
+                    data=functools.partial(read_pdf_artifact, artifacts[with_notes]),
+                    file_name=pdf_file_name(deck[3], lang, with_notes, profile),
+                    mime='application/octet-stream',
+                    icon=':material/download:',
+                    type='primary'
+                )
+                continue
+            if st.button(label):
+                pdf_jobs[with_notes] = submit_pdf_job(session, *deck, lang, with_notes, profile, selection)
+            key = pdf_jobs.get(with_notes)
+            if key and key[0] == deck[1] and key[2:] == (lang, with_notes, profile, selection):
+                job = poll_pdf_job(key, session)
+                pending = job is not None and job["state"] in ("queued", "running")
+                st.fragment(show_pdf_job, run_every=PDF_POLL_INTERVAL if pending else None)(
+                    keys["pdf_jobs"], with_notes, session, text, pending)
+
+def show_footer():
+    # --- Footer (Authors and Copyright)---
+    st.markdown('---')
+    year = 2025 
+    authors = {"Thomas Reimann": [1], "Nils Wallenberg": [2]}
+    institutions = {1: "TU Dresden", 2: "University of Gothenburg"}
+
+    author_list = [f"{name}{''.join(f'<sup>{i}</sup>' for i in idxs)}" for name, idxs in authors.items()]
+    institution_text = " | ".join([f"<sup>{i}</sup> {inst}" for i, inst in institutions.items()])
+    columns_lic = st.columns((2,1))
+
+    with columns_lic[0]:
+        st.markdown(f'**SlideJet developed by** <br> {", ".join(author_list)} ({year}). <br> {institution_text}', unsafe_allow_html=True)
+    with columns_lic[1]:
+        st.markdown('**Open-source license for SlideJet:**', unsafe_allow_html=True)
+        try:
+            st.image(Image.open("FIGS/CC_BY-SA_icon.png"))
+        except FileNotFoundError:
+            st.image("https://raw.githubusercontent.com/gw-inux/SlideJet/main/FIGS/CC_BY-SA_icon.png")
+
+def render_deck(yaml_path: str, app_id: str = "app_01", multipage: bool = False):
+    """
+    Renders a SlideJet presentation, called by the presenter scripts on every rerun.
+    yaml_path is the default YAML (an uploader is shown if it does not exist), app_id namespaces
+    the session state, and with multipage=True the page config is left to the multipage app.
+    """
+    if not multipage:
+        st.set_page_config(page_title="SlideJet - Present", page_icon="🚀")
+
+    keys = session_keys(app_id)
+    st.session_state[keys["perf_depth"]] = 0   # a full run is never nested in another run
+    st.session_state.setdefault(keys["perf_enabled"], False)
+    with perf_script_run(keys, "run"):
+        with perf_phase(keys, "config"):
+            config = load_presentation_config(yaml_path, keys)
+            if st.session_state[keys["config_source"]]:
+                start_warmup(st.session_state[keys["config_source"]])
+        # Also read by the fragment reruns, which do not load the config
+        st.session_state[keys["perf_enabled"]] = perf_enabled(config)
+        with perf_phase(keys, "slides"):
+            slides = load_presentation_slides(keys)
+
+        # --- Print Title and Header 
+        st.header(f':blue[{st.session_state[keys["header_text"]]}]')
+        st.subheader(st.session_state[keys["subheader_text"]], divider='blue')
+
+        st.markdown(""" 
+            **About the SlideJet presentation:** _Navigate the slides using the +/- buttons or enter a slide number._
+        """)
+
+        # --- Show slides ---
+        if slides:
+            if keys["slide_index"] not in st.session_state or st.session_state[keys["slide_index"]] > len(slides):
+                st.session_state[keys["slide_index"]] = 1
+
+            show_slide_viewer(slides, keys, config.get("client_navigation", True))
+            with perf_phase(keys, "downloads"):
+                show_downloads(slides, keys)
+        else:
+            st.warning("The presentation is not loaded yet.")
+
+    if st.session_state[keys["perf_enabled"]]:
+        st.fragment(show_perf_panel, run_every=PERF_PANEL_REFRESH)(keys)
+    show_footer()
@@ -0,0 +1,51 @@
+import os
+import sys
+import threading
+import types
+import pytest
+import streamlit.logger
+
+# The slidejet package lives in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+streamlit.logger.set_log_level("error")
+
+
+class FakeTranslator:
+    """Local stand-in for deep_translator.GoogleTranslator that can hang or fail."""
+    calls = []
+    mode = "ok"                   # "ok", "fail" or "hang"
+    release = threading.Event()   # set to end hanging calls
+
+    def __init__(self, source="auto", target="de", **kwargs):
+        self.target = target
+
+    def translate(self, text, **kwargs):
+        FakeTranslator.calls.append(text)
+        if FakeTranslator.mode == "hang":
+            FakeTranslator.release.wait()
+        if FakeTranslator.mode == "fail":
+            raise RuntimeError("translator failed")
+        return "\n".join(f"[{self.target}] {line}" for line in text.split("\n"))
+
+
+@pytest.fixture
+def translator(monkeypatch):
+    """Fake translator with fresh translation state and short timeouts."""
+    from slidejet import runtime
+
+    monkeypatch.setitem(sys.modules, "deep_translator", types.SimpleNamespace(GoogleTranslator=FakeTranslator))
+    monkeypatch.setattr(runtime, "TRANSLATION_TIMEOUT", 0.2)
+    monkeypatch.setattr(runtime, "TRANSLATION_RETRIES", 2)
+    monkeypatch.setattr(runtime, "TRANSLATION_BACKOFF", 0.01)
+    monkeypatch.setattr(runtime, "BREAKER_THRESHOLD", 3)
+    monkeypatch.setattr(runtime, "BREAKER_COOLDOWN", 0.5)
+    monkeypatch.setattr(runtime, "NEGATIVE_CACHE_TTL", 0.3)
+    for cached in (runtime.get_translation_guard, runtime.get_single_flight, runtime.get_translation_memory,
+                   runtime._translate_notes_cached):
+        cached.clear()
+
+    FakeTranslator.calls = []
+    FakeTranslator.mode = "ok"
+    FakeTranslator.release = threading.Event()
+    yield FakeTranslator
+    FakeTranslator.release.set()
@@ -0,0 +1,20 @@
+import time
+from slidejet import runtime
+
+
+def test_image_prefetch_does_not_wait_for_translation_prefetch(translator, tmp_path):
+    slides = []
+    for i in range(1, 4):
+        (tmp_path / f"slide_{i}.png").write_bytes(b"image %d" % i)
+        slides.append({"image": f"images/slide_{i}.png", "notes": f"Note of slide {i}."})
+    runtime.get_image_cache.clear()
+
+    # A hanging translator keeps the translation prefetch workers busy
+    translator.mode = "hang"
+    runtime.prefetch_translations({}, slides, 1, "de")
+    runtime.prefetch_slide_images(slides, 1, str(tmp_path), ("deck", 1))
+
+    deadline = time.monotonic() + 0.4   # a hanging translation takes longer (timeouts and retries)
+    while runtime.image_cache_stats()["prefetched"] < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert runtime.image_cache_stats()["prefetched"] == 1
@@ -0,0 +1,102 @@
+import os
+import time
+import stat
+import pytest
+from slidejet import runtime
+
+DECK = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "SlideJet_Presentations", "SJ_DATA", "SlideJet_Overview")
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    folder = tmp_path / "pdf_cache"
+    monkeypatch.setattr(runtime, "PDF_CACHE_DIR", str(folder))
+    return folder
+
+
+def test_cache_folder_is_private(cache_dir):
+    assert runtime.pdf_cache_folder() == str(cache_dir)
+    assert stat.S_IMODE(os.stat(cache_dir).st_mode) & 0o077 == 0
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+def test_writable_cache_folder_is_not_used(cache_dir):
+    deck_ref = runtime.file_reference(os.path.join(DECK, "slide_data.json"))
+    slides = runtime.load_deck(*deck_ref)
+    images = os.path.join(DECK, "images")
+
+    # A PDF planted by another user under the content-hash name is never served
+    cache_dir.mkdir()
+    os.chmod(cache_dir, 0o777)
+    path = runtime.pdf_cache_path(deck_ref, images, None, False, "screen")
+    with open(path, "wb") as f:
+        f.write(b"planted")
+    assert runtime.pdf_cache_folder() is None
+
+    name, data = runtime.build_pdf(slides, deck_ref, images, DECK, None, False, profile="screen")
+    assert data.startswith(b"%PDF") and data != b"planted"
+    assert open(path, "rb").read() == b"planted"   # nothing written into the unsafe folder
+
+
+def test_finished_job_keeps_the_cache_path_only(cache_dir, monkeypatch):
+    deck_ref = runtime.file_reference(os.path.join(DECK, "slide_data.json"))
+    slides = runtime.load_deck(*deck_ref)
+    images = os.path.join(DECK, "images")
+    runtime.get_pdf_jobs.clear()
+
+    key = runtime.submit_pdf_job("session", slides, deck_ref, images, DECK, None, False, "screen", (1, 2))
+    job = runtime.poll_pdf_job(key, "session")
+    deadline = time.monotonic() + 60
+    while job["state"] in ("queued", "running") and time.monotonic() < deadline:
+        time.sleep(0.05)
+        job = runtime.poll_pdf_job(key, "session")
+
+    file_name, path, data = job["result"]
+    assert data is None and os.path.isfile(path)
+    assert runtime.read_job_pdf(path).startswith(b"%PDF")
+
+    # Finished jobs expire on poll, not only on the next submit
+    monkeypatch.setattr(runtime, "PDF_JOB_TTL", 0)
+    assert runtime.poll_pdf_job(key, "session") is None
+
+
+def test_evicted_job_is_built_again(cache_dir):
+    deck_ref = runtime.file_reference(os.path.join(DECK, "slide_data.json"))
+    slides = runtime.load_deck(*deck_ref)
+    images = os.path.join(DECK, "images")
+    runtime.get_pdf_jobs.clear()
+
+    def finished_job():
+        key = runtime.submit_pdf_job("session", slides, deck_ref, images, DECK, None, False, "screen", (1,))
+        job = runtime.poll_pdf_job(key, "session")
+        deadline = time.monotonic() + 60
+        while job["state"] in ("queued", "running") and time.monotonic() < deadline:
+            time.sleep(0.05)
+            job = runtime.poll_pdf_job(key, "session")
+        return job
+
+    job = finished_job()
+    os.remove(job["result"][1])   # evicted from the PDF cache
+    assert runtime.pdf_job_evicted(runtime.poll_pdf_job((deck_ref, images, None, False, "screen", (1,)), "session"))
+
+    # Preparing it again starts a new build instead of joining the finished job
+    job = finished_job()
+    assert job["state"] == "done" and os.path.isfile(job["result"][1])
+
+
+def test_files_gone_while_storing_are_skipped(cache_dir, monkeypatch):
+    cache_dir.mkdir()
+    (cache_dir / "other.pdf.tmp").write_bytes(b"built by another job")
+    tmp_path = cache_dir / "deck.pdf.tmp"
+    tmp_path.write_bytes(b"%PDF")
+
+    # Another build moves its temporary file between the listing and the stat
+    scandir = os.scandir
+    def racing_scandir(folder):
+        entries = list(scandir(folder))
+        os.replace(cache_dir / "other.pdf.tmp", cache_dir / "other.pdf")
+        return entries
+    monkeypatch.setattr(runtime.os, "scandir", racing_scandir)
+
+    runtime.store_pdf(str(tmp_path), str(cache_dir / "deck.pdf"))
+    assert (cache_dir / "deck.pdf").read_bytes() == b"%PDF"
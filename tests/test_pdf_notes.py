@@ -0,0 +1,43 @@
+import io
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from slidejet import runtime
+
+WIDTH = 300
+
+
+def line_width(indent, runs):
+    return indent + sum(stringWidth(text, runtime.NOTES_FONTS[font], runtime.NOTES_FONT_SIZE) for font, text in runs)
+
+
+def test_emphasis_is_rendered_with_fonts():
+    (marker, indent, runs), = runtime.wrap_notes("Plain **bold** and *italic*, ***both*** or __bold__ file_name_here", WIDTH)
+    assert runs == [("/F1", "Plain "), ("/F2", "bold"), ("/F1", " and "), ("/F3", "italic"), ("/F1", ", "),
+                    ("/F4", "both"), ("/F1", " or "), ("/F2", "bold"), ("/F1", " file_name_here")]
+
+
+def test_list_items_and_headings():
+    lines = runtime.wrap_notes("# Summary\r- first item\n2. second item", WIDTH)
+    assert lines[0] == (None, 0.0, [("/F2", "Summary")])
+    assert lines[1] == ("•", runtime.NOTES_INDENT, [("/F1", "first item")])
+    assert lines[2] == ("2.", runtime.NOTES_INDENT, [("/F1", "second item")])
+
+
+def test_lines_fit_the_width():
+    url = "https://example.org/" + "a-very-long-path/" * 20
+    notes = f"See {url} for **details** and " + "more words " * 40 + "\r- item with " + "long text " * 20
+    lines = runtime.wrap_notes(notes, WIDTH)
+    assert len(lines) > 5
+    assert all(line_width(indent, runs) <= WIDTH for marker, indent, runs in lines)
+    assert "".join(text for _, _, runs in lines for _, text in runs).count("a-very-long-path") == 20
+
+
+def test_notes_pdf_has_all_fonts():
+    contents = runtime.notes_page_contents("**Bold** and *italic*\r- item", None, None, 960, 540)
+    output = io.BytesIO()
+    image = {"key": "image", "entries": {"Width": 1, "Height": 1, "ColorSpace": "/DeviceGray", "BitsPerComponent": 8},
+             "data": b"\x00", "size": (1, 1)}
+    runtime.write_pages_pdf([(image, contents)], output, notes=True)
+    pdf = output.getvalue()
+    for font in runtime.NOTES_FONTS.values():
+        assert f"/BaseFont /{font}".encode() in pdf
+    assert b"/F2 11 Tf (Bold) Tj" in contents[0] and b"/F3 11 Tf (italic) Tj" in contents[0]
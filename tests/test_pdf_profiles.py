@@ -0,0 +1,18 @@
+import io
+from PIL import Image
+from slidejet import runtime
+
+
+def test_profiles_downsample_the_pdf_without_notes(tmp_path):
+    # PowerPoint exports slides at 96 dpi
+    path = tmp_path / "slide_1.png"
+    Image.new("RGB", (1280, 720), "white").save(path, dpi=(96, 96))
+
+    sizes = {}
+    for name in ("screen", "print"):
+        output = io.BytesIO()
+        runtime.encode_pdf_image(str(path), runtime.PDF_PROFILES[name], None, output)
+        with Image.open(output) as img:
+            sizes[name] = img.size
+    assert sizes["screen"] == (runtime.PDF_SLIDE_WIDTH * 96, runtime.PDF_SLIDE_WIDTH * 96 * 720 // 1280)
+    assert sizes["print"] == (1280, 720)   # below 150 dpi already, never upsampled
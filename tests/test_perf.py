@@ -0,0 +1,53 @@
+import json
+import logging
+import pytest
+from slidejet import runtime
+
+KEYS = runtime.session_keys("test")
+
+
+@pytest.fixture
+def session(monkeypatch, caplog):
+    """Plain dict as session state, with the perf panel enabled and its log lines captured."""
+    state = {KEYS["perf_enabled"]: True}
+    monkeypatch.setattr(runtime.st, "session_state", state)
+    monkeypatch.setattr(runtime.perf_logger, "propagate", True)
+    caplog.set_level(logging.INFO, logger="slidejet.perf")
+    return state
+
+
+def logged_runs(caplog):
+    return [json.loads(record.getMessage()) for record in caplog.records if record.name == "slidejet.perf"]
+
+
+def test_fragment_reruns_are_logged_with_their_own_timings(session, caplog):
+    # Full run: the viewer and notes fragments run nested in it
+    with runtime.perf_script_run(KEYS, "run"):
+        with runtime.perf_phase(KEYS, "config"):
+            pass
+        with runtime.perf_script_run(KEYS, "viewer"):
+            with runtime.perf_script_run(KEYS, "notes"):
+                pass
+    runs = logged_runs(caplog)
+    assert [run["run"] for run in runs] == ["run"]
+    assert set(runs[0]["phases_ms"]) == {"config", "viewer", "notes", "run"}
+
+    # Navigating reruns only the viewer (with the notes), changing the language only the notes
+    with runtime.perf_script_run(KEYS, "viewer"):
+        with runtime.perf_script_run(KEYS, "notes"):
+            pass
+    with runtime.perf_script_run(KEYS, "notes"):
+        pass
+    runs = logged_runs(caplog)
+    assert [run["run"] for run in runs] == ["run", "viewer", "notes"]
+    assert set(runs[1]["phases_ms"]) == {"viewer", "notes"}
+    assert set(runs[2]["phases_ms"]) == {"notes"}
+    assert set(session[KEYS["perf_run"]]) == {"notes"}
+
+
+def test_runs_are_not_logged_when_disabled(session, caplog):
+    session[KEYS["perf_enabled"]] = False
+    with runtime.perf_script_run(KEYS, "notes"):
+        pass
+    assert logged_runs(caplog) == []
+    assert set(session[KEYS["perf_run"]]) == {"notes"}
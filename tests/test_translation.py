@@ -0,0 +1,90 @@
+import time
+import pytest
+from slidejet import runtime
+
+NOTE = "SlideJet shows the notes of every slide."
+
+
+def test_hanging_call_times_out(translator, monkeypatch):
+    monkeypatch.setattr(runtime, "TRANSLATION_RETRIES", 0)
+    translator.mode = "hang"
+    start = time.monotonic()
+    with pytest.raises(runtime.TranslationError):
+        runtime.call_translator(translator().translate, NOTE)
+    assert time.monotonic() - start < 1
+
+
+def test_retries_are_bounded(translator):
+    translator.mode = "fail"
+    with pytest.raises(runtime.TranslationError):
+        runtime.call_translator(translator().translate, NOTE)
+    assert len(translator.calls) == runtime.TRANSLATION_RETRIES + 1
+
+
+def test_breaker_opens_and_falls_back_to_original_notes(translator):
+    translator.mode = "fail"
+    assert runtime.translate_notes(NOTE, "de") == NOTE
+    assert runtime.translation_failed(NOTE, "de")
+
+    # The breaker is open: other notes fall back without calling the translator
+    calls = len(translator.calls)
+    assert runtime.translate_notes("Another note.", "de") == "Another note."
+    assert len(translator.calls) == calls
+
+
+def test_negative_cache_expires(translator):
+    translator.mode = "fail"
+    assert runtime.translate_notes(NOTE, "de") == NOTE
+    translator.mode = "ok"
+    assert runtime.translate_notes(NOTE, "de") == NOTE   # still in the negative cache
+
+    time.sleep(max(runtime.NEGATIVE_CACHE_TTL, runtime.BREAKER_COOLDOWN) + 0.1)
+    assert not runtime.translation_failed(NOTE, "de")
+    assert runtime.translate_notes(NOTE, "de") == f"[de] {NOTE}"
+
+
+def test_failure_is_not_cached(translator):
+    translator.mode = "fail"
+    with pytest.raises(runtime.TranslationError):
+        runtime._translate_notes_cached(NOTE, "de")
+
+    translator.mode = "ok"
+    runtime.get_translation_guard.clear()   # close the breaker
+    assert runtime._translate_notes_cached(NOTE, "de") == f"[de] {NOTE}"
+
+
+def test_hung_requests_do_not_block_later_translations(translator, monkeypatch):
+    monkeypatch.setattr(runtime, "TRANSLATION_RETRIES", 0)
+    monkeypatch.setattr(runtime, "BREAKER_THRESHOLD", 100)
+    translator.mode = "hang"
+    for _ in range(20):
+        with pytest.raises(runtime.TranslationError):
+            runtime.call_translator(translator().translate, NOTE)
+
+    # The provider recovers while the hung requests still run
+    translator.mode = "ok"
+    assert runtime.translate_notes(NOTE, "de") == f"[de] {NOTE}"
+
+
+def test_prefetch_keeps_only_pending_translations(translator):
+    slides = [{"notes": f"Note of slide {i}."} for i in range(1, 21)]
+    state = {}
+    for index in range(1, 21):
+        runtime.prefetch_translations(state, slides, index, "de")
+        for future in list(state["futures"].values()):
+            future.result(timeout=5)
+
+    runtime.prefetch_translations(state, slides, 20, "de")
+    assert state["futures"] == {}
+    assert len(translator.calls) == 20   # every neighbor was prefetched once
+
+
+def test_known_translations_do_not_wait_for_the_pool(translator):
+    assert runtime.translate_notes(NOTE, "de") == f"[de] {NOTE}"
+
+    # Slow translations of other notes keep all notes workers busy
+    translator.mode = "hang"
+    for i in range(8):
+        runtime.get_notes_executor().submit(runtime.translate_notes, f"Other note {i}.", "de")
+    future = runtime.submit_translation(NOTE, "de")
+    assert future.done() and future.result() == f"[de] {NOTE}"